@@ -1,5 +1,7 @@
+import argparse
 import pygame
 import numpy as np
+import random
 import sys
 import time
 import os
@@ -13,13 +15,19 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 # --- IMPORTS ---
-import smart_tron_bot
+import bot_loader
+import maps
+import replay
+from instrumentation import Instruments, TimedPlayer
+from renderer import BoardRenderer, CachedFont, fit_cell
+from tron_engine import TronEngine, P1, P2
 
 # --- CONSTANTS ---
 GAME_WIDTH = 600
 SIDEBAR_WIDTH = 340
 WIDTH = GAME_WIDTH + SIDEBAR_WIDTH
 HEIGHT = 600
+# Default board (no map given): open, 20-pixel cells
 GRID_SIZE = 20
 COLS = GAME_WIDTH // GRID_SIZE
 ROWS = HEIGHT // GRID_SIZE
@@ -38,8 +46,34 @@ PURPLE = (180, 50, 255)
 INPUT_BG = (50, 50, 60)
 INPUT_ACTIVE = (80, 80, 100)
 
+SIDEBAR_RECT = pygame.Rect(GAME_WIDTH - 1, 0, SIDEBAR_WIDTH + 1, HEIGHT)
+DIVIDER_RECT = pygame.Rect(GAME_WIDTH - 1, 0, 3, HEIGHT)
+START_BUTTON = pygame.Rect(GAME_WIDTH + 30, 400, 280, 60)
+
+# --- PACING ---
+# Normal play runs one step per frame at GAME_FPS and shows each round
+# result for ROUND_PAUSE_MS. Turbo mode (T key / --turbo) simulates as fast
+# as the bots allow and only redraws TURBO_FPS times a second, with no
+# pause between rounds.
+GAME_FPS = 60
+ROUND_PAUSE_MS = 2000
+TURBO_FPS = 30
+
+# How often the live p99 in the sidebar is refreshed
+STATS_REFRESH_MS = 500
+
+# --- BOTS ---
+# Arena-standard bot modules; isolated bots run in their own subprocess and
+# forfeit the round if a move takes longer than BOT_TIME_LIMIT seconds.
+# (A frozen build has no separate interpreter to start them with.)
+DEFAULT_BOT = "smart_tron_bot"
+ISOLATE_BOTS = not getattr(sys, "frozen", False)
+BOT_TIME_LIMIT = bot_loader.TIME_LIMIT
+
 class TronGame:
-    def __init__(self):
+    def __init__(self, p1_bot=DEFAULT_BOT, p2_bot=DEFAULT_BOT, isolated=ISOLATE_BOTS,
+                 time_limit=BOT_TIME_LIMIT, turbo=False, replay_path=None,
+                 stats_path=None, profile_path=None, map_name=None):
         pygame.init()
         pygame.mixer.init() 
         
@@ -70,22 +104,22 @@ class TronGame:
 
         # --- FONTS ---
         try:
-            self.title_font = pygame.font.SysFont("impact", 40)
-            self.header_font = pygame.font.SysFont("monospace", 28, bold=True)
-            self.text_font = pygame.font.SysFont("monospace", 18)
-            self.score_font = pygame.font.SysFont("monospace", 50, bold=True)
-            self.status_font = pygame.font.SysFont("monospace", 22, bold=True)
-            self.input_font = pygame.font.SysFont("monospace", 22)
-            self.huge_font = pygame.font.SysFont("monospace", 60, bold=True) # For Game Over
+            self.title_font = CachedFont(pygame.font.SysFont("impact", 40))
+            self.header_font = CachedFont(pygame.font.SysFont("monospace", 28, bold=True))
+            self.text_font = CachedFont(pygame.font.SysFont("monospace", 18))
+            self.score_font = CachedFont(pygame.font.SysFont("monospace", 50, bold=True))
+            self.status_font = CachedFont(pygame.font.SysFont("monospace", 22, bold=True))
+            self.input_font = CachedFont(pygame.font.SysFont("monospace", 22))
+            self.huge_font = CachedFont(pygame.font.SysFont("monospace", 60, bold=True)) # For Game Over
         except:
              # Fallbacks
-             self.title_font = pygame.font.SysFont("Arial", 40, bold=True)
-             self.header_font = pygame.font.SysFont("Courier", 28, bold=True)
-             self.text_font = pygame.font.SysFont("Courier", 18)
-             self.score_font = pygame.font.SysFont("Courier", 50, bold=True)
-             self.status_font = pygame.font.SysFont("Courier", 22, bold=True)
-             self.input_font = pygame.font.SysFont("Courier", 22)
-             self.huge_font = pygame.font.SysFont("Courier", 60, bold=True)
+             self.title_font = CachedFont(pygame.font.SysFont("Arial", 40, bold=True))
+             self.header_font = CachedFont(pygame.font.SysFont("Courier", 28, bold=True))
+             self.text_font = CachedFont(pygame.font.SysFont("Courier", 18))
+             self.score_font = CachedFont(pygame.font.SysFont("Courier", 50, bold=True))
+             self.status_font = CachedFont(pygame.font.SysFont("Courier", 22, bold=True))
+             self.input_font = CachedFont(pygame.font.SysFont("Courier", 22))
+             self.huge_font = CachedFont(pygame.font.SysFont("Courier", 60, bold=True))
 
         # --- APP STATE ---
         self.state = "SETUP"
@@ -101,22 +135,69 @@ class TronGame:
         self.p2_name = "RED BOT"
         self.max_matches = 20
         
+        # Timing of bot moves and frame phases (see instrumentation.py);
+        # the summary goes to stats_path and the opt-in profile to
+        # profile_path when the tournament ends
+        self.stats_path = stats_path
+        self.profile_path = profile_path
+        self.instruments = Instruments(profile=profile_path is not None)
+        self.live_p99 = (0.0, 0.0)
+        self.live_p99_time = 0
+        self.last_frame = None
+        self.stats_written = False
+
+        # Bots (workers stay up for the whole tournament)
+        self.p1_bot = p1_bot
+        self.p2_bot = p2_bot
+        self.bot1 = TimedPlayer(bot_loader.load_player(p1_bot, isolated, time_limit),
+                                self.instruments.histogram("p1_move"))
+        self.bot2 = TimedPlayer(bot_loader.load_player(p2_bot, isolated, time_limit),
+                                self.instruments.histogram("p2_move"))
+
         # Tournament Logic
         self.match_count = 1
         self.p1_score = 0
         self.p2_score = 0
         self.tournament_over = False
-        
+        self.turbo = turbo
+        self.round_end_time = 0
+
+        # Replay recording (see replay.py); the file is opened per tournament
+        self.replay_path = replay_path
+        self.recorder = None
+        self.round_moves = []
+
+        # Board: a map file or the default open board (see maps.py), with
+        # cells scaled to fit the play area
+        self.map = maps.load_map(map_name) if map_name else maps.Map(COLS, ROWS)
+        cell = fit_cell(self.map.cols, self.map.rows, GAME_WIDTH, HEIGHT)
+
+        # Retained-mode drawing (see renderer.py)
+        self.renderer = BoardRenderer(self.map.cols, self.map.rows, cell,
+                                      {P1: (NEON_BLUE, (150, 255, 255)), P2: (NEON_RED, (255, 150, 150))},
+                                      {P1: NEON_BLUE, P2: NEON_RED},
+                                      background=BLACK, grid_color=GRID_COLOR,
+                                      area=pygame.Rect(0, 0, GAME_WIDTH, HEIGHT))
+        self.sidebar_key = None
+
+        self.engine = TronEngine.from_map(self.map)
         self.reset_round()
 
     def reset_round(self):
-        self.grid = np.zeros((COLS, ROWS))
-        self.p1_pos = [5, ROWS // 2]
-        self.p2_pos = [COLS - 6, ROWS // 2]
-        self.grid[self.p1_pos[0]][self.p1_pos[1]] = 1
-        self.grid[self.p2_pos[0]][self.p2_pos[1]] = 2
+        self.engine.reset()
+        # A whole new board: redraw it all once
+        self.renderer.invalidate()
         self.round_over = False
         self.winner = None
+        # Every round gets a seed of its own, kept in the replay
+        self.round_seed = random.getrandbits(32)
+        random.seed(self.round_seed)
+        np.random.seed(self.round_seed)
+        self.round_moves = []
+        # Bots see the full board once per round, then only the new heads
+        engine = self.engine
+        self.bot1.start(engine.grid, engine.p1_pos, P1, engine.p2_pos)
+        self.bot2.start(engine.grid, engine.p2_pos, P2, engine.p1_pos)
 
     def toggle_fullscreen(self):
         self.fullscreen = not self.fullscreen
@@ -124,6 +205,9 @@ class TronGame:
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
         else:
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # New display surface: everything has to be drawn again
+        self.renderer.invalidate()
+        self.sidebar_key = None
 
     def start_tournament(self):
         if self.input_p1.strip() != "": self.p1_name = self.input_p1
@@ -142,8 +226,31 @@ class TronGame:
         self.match_count = 1
         self.p1_score = 0
         self.p2_score = 0
+        if self.replay_path is not None:
+            self.recorder = replay.ReplayWriter(self.replay_path, self.map.cols, self.map.rows,
+                                                (self.p1_name, self.p2_name), self.map.walls)
+        self.instruments.start_profile()
         self.reset_round()
 
+    def finish_tournament(self):
+        """Closes the replay and writes the stats/profile, once per tournament."""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.state != "PLAYING" or self.stats_written:
+            return
+        self.stats_written = True
+        self.instruments.stop_profile()
+        if self.stats_path is not None:
+            self.instruments.export(self.stats_path, (self.p1_bot, self.p2_bot), {
+                "p1_bot": self.p1_bot, "p2_bot": self.p2_bot,
+                "matches": self.match_count, "p1_score": self.p1_score, "p2_score": self.p2_score,
+                "p1_timeouts": getattr(self.bot1, "timeouts", 0),
+                "p2_timeouts": getattr(self.bot2, "timeouts", 0),
+            })
+        if self.profile_path is not None:
+            self.instruments.dump_profile(self.profile_path)
+
     def draw_input_box(self, label, text, y_pos, field_index):
         lbl = self.text_font.render(label, True, (180, 180, 180))
         self.screen.blit(lbl, (GAME_WIDTH + 30, y_pos))
@@ -156,6 +263,14 @@ class TronGame:
         txt_surf = self.input_font.render(text, True, WHITE)
         self.screen.blit(txt_surf, (GAME_WIDTH + 40, y_pos + 35))
 
+    def sidebar_state(self):
+        if self.state == "SETUP":
+            hover = START_BUTTON.collidepoint(pygame.mouse.get_pos())
+            return (self.state, self.input_p1, self.input_p2, self.input_matches,
+                    self.active_field, hover)
+        return (self.state, self.match_count, self.max_matches, self.p1_score, self.p2_score,
+                self.round_over, self.winner, self.tournament_over, self.turbo, self.live_p99)
+
     def draw_sidebar_setup(self):
         pygame.draw.rect(self.screen, SIDEBAR_BG, (GAME_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT))
         pygame.draw.line(self.screen, DARK_GRAY, (GAME_WIDTH, 0), (GAME_WIDTH, HEIGHT), 3)
@@ -167,7 +282,7 @@ class TronGame:
         self.draw_input_box("Red Bot Name:", self.input_p2, 200, 1)
         self.draw_input_box("Number of Matches (Default: 20):", self.input_matches, 280, 2)
 
-        btn_rect = pygame.Rect(GAME_WIDTH + 30, 400, 280, 60)
+        btn_rect = START_BUTTON
         mouse_pos = pygame.mouse.get_pos()
         if btn_rect.collidepoint(mouse_pos):
             pygame.draw.rect(self.screen, (0, 200, 0), btn_rect, border_radius=10)
@@ -269,18 +384,22 @@ class TronGame:
         match_text = self.status_font.render(match_str, True, BLACK if progress > 0.5 else WHITE)
         self.screen.blit(match_text, match_text.get_rect(center=(center_x, 115)))
 
+        if self.turbo:
+            turbo_text = self.text_font.render("TURBO (T to slow down)", True, YELLOW)
+            self.screen.blit(turbo_text, turbo_text.get_rect(center=(center_x, 150)))
+
         # Cards
         pygame.draw.rect(self.screen, (10, 30, 40), (GAME_WIDTH + 20, 170, 300, 70), border_radius=10)
         pygame.draw.rect(self.screen, NEON_BLUE, (GAME_WIDTH + 20, 170, 300, 70), 2, border_radius=10)
         p1_label = self.header_font.render(self.p1_name[:12], True, NEON_BLUE)
         self.screen.blit(p1_label, (GAME_WIDTH + 35, 180))
-        self.screen.blit(self.text_font.render("Voronoi AI", True, (100, 200, 255)), (GAME_WIDTH + 35, 210))
+        self.screen.blit(self.text_font.render(self.p1_bot[:26], True, (100, 200, 255)), (GAME_WIDTH + 35, 210))
 
         pygame.draw.rect(self.screen, (40, 10, 10), (GAME_WIDTH + 20, 260, 300, 70), border_radius=10)
         pygame.draw.rect(self.screen, NEON_RED, (GAME_WIDTH + 20, 260, 300, 70), 2, border_radius=10)
         p2_label = self.header_font.render(self.p2_name[:12], True, NEON_RED)
         self.screen.blit(p2_label, (GAME_WIDTH + 35, 270))
-        self.screen.blit(self.text_font.render("Voronoi AI", True, (255, 100, 100)), (GAME_WIDTH + 35, 300))
+        self.screen.blit(self.text_font.render(self.p2_bot[:26], True, (255, 100, 100)), (GAME_WIDTH + 35, 300))
 
         # Scoreboard
         score_bg_rect = pygame.Rect(GAME_WIDTH + 20, 380, 300, 100)
@@ -310,42 +429,88 @@ class TronGame:
             res_text = self.header_font.render(msg, True, color)
             self.screen.blit(res_text, res_text.get_rect(center=res_bg.center))
 
+        # Live move latency
+        p1_p99, p2_p99 = self.live_p99
+        latency = self.text_font.render(f"p99 move: {p1_p99:.1f} / {p2_p99:.1f} ms", True, (100, 100, 100))
+        self.screen.blit(latency, latency.get_rect(center=(center_x, 580)))
+
     def draw(self):
-        self.screen.fill(BLACK)
-        
-        for x in range(0, GAME_WIDTH, GRID_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (x, 0), (x, HEIGHT), 1)
-        for y in range(0, HEIGHT, GRID_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (0, y), (GAME_WIDTH, y), 1)
-
-        for x in range(COLS):
-            for y in range(ROWS):
-                if self.grid[x][y] == 1:
-                    pygame.draw.rect(self.screen, NEON_BLUE, (x*GRID_SIZE, y*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(self.screen, (150, 255, 255), (x*GRID_SIZE+5, y*GRID_SIZE+5, GRID_SIZE-10, GRID_SIZE-10))
-                elif self.grid[x][y] == 2:
-                    pygame.draw.rect(self.screen, NEON_RED, (x*GRID_SIZE, y*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(self.screen, (255, 150, 150), (x*GRID_SIZE+5, y*GRID_SIZE+5, GRID_SIZE-10, GRID_SIZE-10))
-
-        pygame.draw.rect(self.screen, WHITE, (self.p1_pos[0]*GRID_SIZE, self.p1_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(self.screen, NEON_BLUE, (self.p1_pos[0]*GRID_SIZE, self.p1_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE), 2)
-        
-        pygame.draw.rect(self.screen, WHITE, (self.p2_pos[0]*GRID_SIZE, self.p2_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(self.screen, NEON_RED, (self.p2_pos[0]*GRID_SIZE, self.p2_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE), 2)
+        # Only cells that changed since the last frame are redrawn
+        engine = self.engine
+        dirty = self.renderer.draw(self.screen, engine.grid,
+                                   [(engine.p1_pos, P1), (engine.p2_pos, P2)])
+        if any(rect.right >= GAME_WIDTH for rect in dirty):
+            # The last column overlaps the sidebar divider
+            pygame.draw.line(self.screen, DARK_GRAY, (GAME_WIDTH, 0), (GAME_WIDTH, HEIGHT), 3)
+            dirty.append(DIVIDER_RECT)
+
+        # The sidebar is redrawn only when something it shows changed
+        key = self.sidebar_state()
+        if key != self.sidebar_key:
+            self.sidebar_key = key
+            if self.state == "SETUP":
+                self.draw_sidebar_setup()
+            else:
+                self.draw_sidebar_game()
+            dirty.append(SIDEBAR_RECT)
 
-        if self.state == "SETUP":
-            self.draw_sidebar_setup()
-        else:
-            self.draw_sidebar_game()
-            
-        pygame.display.update()
+        pygame.display.update(dirty)
 
-    def is_safe(self, x, y):
-        if x < 0 or x >= COLS or y < 0 or y >= ROWS:
-            return False
-        if self.grid[x][y] != 0:
-            return False
-        return True
+    def draw_timed(self):
+        """draw(), recording frame and draw times while a tournament is running."""
+        if self.state != "PLAYING" or self.tournament_over:
+            self.draw()
+            return
+        start = time.perf_counter()
+        if self.last_frame is not None:
+            self.instruments.histogram("frame").record(start - self.last_frame)
+        self.last_frame = start
+
+        now = pygame.time.get_ticks()
+        if now - self.live_p99_time >= STATS_REFRESH_MS:
+            self.live_p99_time = now
+            self.live_p99 = tuple(round(1000 * self.instruments.histogram(name).percentile(99), 1)
+                                  for name in ("p1_move", "p2_move"))
+        self.draw()
+        self.instruments.histogram("draw").record(time.perf_counter() - start)
+
+    def advance(self):
+        """One simulation tick, or the next round once the result has been shown."""
+        if self.round_over:
+            if not self.turbo and pygame.time.get_ticks() < self.round_end_time:
+                return
+            if self.match_count < self.max_matches:
+                self.match_count += 1
+                self.reset_round()
+            else:
+                self.tournament_over = True
+                self.finish_tournament()
+            return
+
+        engine = self.engine
+        move1 = self.bot1.step(engine.p1_pos, engine.p2_pos)
+        move2 = self.bot2.step(engine.p2_pos, engine.p1_pos)
+
+        self.round_moves.append((move1, move2))
+        start = time.perf_counter()
+        result = engine.step(move1, move2)
+        self.instruments.histogram("engine_step").record(time.perf_counter() - start)
+        # The new heads are the only cells the step set
+        self.renderer.mark((engine.p1_pos, engine.p2_pos))
+        if result is not None:
+            if self.recorder is not None:
+                self.recorder.add_round(self.round_seed, engine.starts, self.round_moves, result)
+            if self.sounds_loaded and not self.turbo: self.snd_crash.play()
+            if result == P1:
+                self.winner = "BLUE"
+                self.p1_score += 1
+            elif result == P2:
+                self.winner = "RED"
+                self.p2_score += 1
+            else:
+                self.winner = "DRAW"
+            self.round_over = True
+            self.round_end_time = pygame.time.get_ticks() + ROUND_PAUSE_MS
 
     def run(self):
         running = True
@@ -357,6 +522,8 @@ class TronGame:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_f:
                         self.toggle_fullscreen()
+                    if event.key == pygame.K_t and self.state == "PLAYING":
+                        self.turbo = not self.turbo
                     if event.key == pygame.K_ESCAPE:
                         running = False
                         
@@ -393,66 +560,49 @@ class TronGame:
                                         if event.unicode.isdigit():
                                             self.input_matches += event.unicode
 
-            if self.state == "PLAYING":
-                if not self.tournament_over and not self.round_over:
-                    self.clock.tick(60) 
-                    
-                    move1 = smart_tron_bot.get_move(self.grid.copy(), self.p1_pos, 1, self.p2_pos)
-                    move2 = smart_tron_bot.get_move(self.grid.copy(), self.p2_pos, 2, self.p1_pos)
-
-                    new_p1 = list(self.p1_pos)
-                    if move1 == "UP": new_p1[1] -= 1
-                    elif move1 == "DOWN": new_p1[1] += 1
-                    elif move1 == "LEFT": new_p1[0] -= 1
-                    elif move1 == "RIGHT": new_p1[0] += 1
-
-                    new_p2 = list(self.p2_pos)
-                    if move2 == "UP": new_p2[1] -= 1
-                    elif move2 == "DOWN": new_p2[1] += 1
-                    elif move2 == "LEFT": new_p2[0] -= 1
-                    elif move2 == "RIGHT": new_p2[0] += 1
-
-                    p1_dead = not self.is_safe(new_p1[0], new_p1[1])
-                    p2_dead = not self.is_safe(new_p2[0], new_p2[1])
-                    
-                    if new_p1 == new_p2:
-                        p1_dead = True
-                        p2_dead = True
-
-                    if p1_dead or p2_dead:
-                        if self.sounds_loaded: self.snd_crash.play()
-                        if p1_dead and p2_dead:
-                            self.winner = "DRAW"
-                        elif p1_dead:
-                            self.winner = "RED"
-                            self.p2_score += 1
-                        elif p2_dead:
-                            self.winner = "BLUE"
-                            self.p1_score += 1
-                        self.round_over = True
-                    else:
-                        self.p1_pos = new_p1
-                        self.grid[new_p1[0]][new_p1[1]] = 1
-                        self.p2_pos = new_p2
-                        self.grid[new_p2[0]][new_p2[1]] = 2
-                
-                elif self.round_over and not self.tournament_over:
-                    self.draw() 
-                    pygame.time.wait(2000)
-                    
-                    if self.match_count < self.max_matches:
-                        self.match_count += 1
-                        self.reset_round()
-                    else:
-                        self.tournament_over = True
-            
-            self.draw()
-            if self.state == "SETUP":
+            if self.state == "PLAYING" and not self.tournament_over:
+                if self.turbo:
+                    # Simulate flat out for one frame's worth of time; the
+                    # screen and the event queue catch up once per frame
+                    frame_end = time.perf_counter() + 1.0 / TURBO_FPS
+                    while not self.tournament_over and time.perf_counter() < frame_end:
+                        self.advance()
+                else:
+                    if not self.round_over:
+                        self.clock.tick(GAME_FPS)
+                    self.advance()
+
+            self.draw_timed()
+            if self.state == "SETUP" or self.tournament_over:
                 self.clock.tick(30)
+            elif self.round_over and not self.turbo:
+                # Showing the round result: no need to spin
+                self.clock.tick(GAME_FPS)
 
+        self.finish_tournament()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = TronGame()
+    parser = argparse.ArgumentParser(description="TRON AI tournament arena.")
+    parser.add_argument("--p1", default=DEFAULT_BOT, help="Blue bot module")
+    parser.add_argument("--p2", default=DEFAULT_BOT, help="Red bot module")
+    parser.add_argument("--time-limit", type=float, default=BOT_TIME_LIMIT,
+                        help="Seconds per move for isolated bots")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Import the bots instead of isolating them in subprocesses")
+    parser.add_argument("--turbo", action="store_true",
+                        help="Simulate at full speed, redrawing at most %d times a second" % TURBO_FPS)
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="Append every round to this replay file (see replay.py)")
+    parser.add_argument("--stats", default=None, metavar="PATH",
+                        help="Write move/frame latency stats as JSON when the tournament ends")
+    parser.add_argument("--map", default=None,
+                        help="Map name (%s) or .tmap file" % ", ".join(maps.available_maps()))
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="Run the tournament under cProfile and save the profile here")
+    args = parser.parse_args()
+
+    game = TronGame(args.p1, args.p2, ISOLATE_BOTS and not args.in_process, args.time_limit,
+                    args.turbo, args.record, args.stats, args.profile, args.map)
     game.run()
@@ -0,0 +1,145 @@
+import argparse
+import time
+
+import numpy as np
+
+from flatboard import FREE, WALL
+from tron_engine import DRAW, P1, P2
+
+# --- BATCH SIMULATION ---
+# N independent rounds stepped in lockstep with whole-array NumPy ops,
+# for bot evaluation and tuning at game counts the per-round engine
+# cannot reach. Boards use the FlatBoard layout (see flatboard.py): a
+# wall border around each (cols, rows) board, so a move is one offset
+# added to a flat cell index and walls need no bounds checks. All N
+# padded boards sit back to back in one buffer, and heads are stored as
+# indices into it.
+#
+# Moves are codes, indices into MOVES (the replay.py encoding); any other
+# value crashes like an unknown move in TronEngine. Finished games are
+# reset in the same step, so every slot is always mid-round.
+
+MOVES = ("UP", "DOWN", "LEFT", "RIGHT")
+ONGOING = -1
+
+class BatchEngine:
+    """
+    `games` rounds on a cols x rows board. `boards` is the (games, cols,
+    rows) uint8 view of the cells (0 free, P1, P2, WALL). step() returns per-game
+    winners, ONGOING for games still running; `wins` totals the finished
+    games by result and `lengths` holds each game's last round length.
+    `walls` and `starts` (the first two are used) come from a map, see maps.py.
+    """
+    def __init__(self, games, cols, rows, starts=None, walls=None):
+        self.games = games
+        self.cols = cols
+        self.rows = rows
+        self.stride = rows + 2
+        self.size = (cols + 2) * self.stride
+        if starts is None:
+            starts = ([5, rows // 2], [cols - 6, rows // 2])
+        self.starts = [list(pos) for pos in starts[:2]]
+
+        # Move code -> offset; unknown codes stay on the (taken) head cell
+        self.offsets = np.zeros(256, dtype=np.int64)
+        self.offsets[:4] = (-1, 1, -self.stride, self.stride)
+
+        self.padded = np.full((games, cols + 2, self.stride), WALL, dtype=np.uint8)
+        self.padded[:, 1:-1, 1:-1] = FREE
+        self.cells = self.padded.reshape(-1)
+        self.boards = self.padded[:, 1:-1, 1:-1]
+
+        # The board every round starts from
+        template = np.full((cols + 2, self.stride), WALL, dtype=np.uint8)
+        template[1:-1, 1:-1] = FREE
+        if walls is not None:
+            template[1:-1, 1:-1][walls] = WALL
+        self.start_cells = [(x + 1) * self.stride + y + 1 for x, y in self.starts]
+        template.reshape(-1)[self.start_cells] = (P1, P2)
+        self.template = template.reshape(-1)
+
+        self.base = np.arange(games, dtype=np.int64) * self.size
+        self.heads = np.empty((games, 2), dtype=np.int64)
+        self.ticks = np.zeros(games, dtype=np.int64)
+        self.lengths = np.zeros(games, dtype=np.int64)
+        self.wins = np.zeros(3, dtype=np.int64)
+        self.reset()
+
+    def reset(self, done=None):
+        """Starts new rounds in the games selected by `done` (default: all)."""
+        if done is None:
+            done = np.ones(self.games, dtype=bool)
+        self.cells.reshape(self.games, self.size)[done] = self.template
+        self.heads[done] = self.base[done, None] + self.start_cells
+        self.ticks[done] = 0
+
+    def positions(self):
+        """Heads as (games, 2 players, x/y) board coordinates."""
+        x, y = np.divmod(self.heads - self.base[:, None], self.stride)
+        return np.stack([x - 1, y - 1], axis=-1)
+
+    def free_moves(self):
+        """(games, 2 players, 4 moves) bool: which moves land on a free cell."""
+        return self.cells[self.heads[:, :, None] + self.offsets[:4]] == FREE
+
+    def step(self, moves1, moves2):
+        """Advances every game one tick; returns the winners (ONGOING if not over)."""
+        cells = self.cells
+        next1 = self.heads[:, 0] + self.offsets[np.asarray(moves1, dtype=np.uint8)]
+        next2 = self.heads[:, 1] + self.offsets[np.asarray(moves2, dtype=np.uint8)]
+
+        head_on = next1 == next2
+        dead1 = (cells[next1] != FREE) | head_on
+        dead2 = (cells[next2] != FREE) | head_on
+        self.ticks += 1
+
+        alive = ~(dead1 | dead2)
+        cells[next1[alive]] = P1
+        cells[next2[alive]] = P2
+        self.heads[alive, 0] = next1[alive]
+        self.heads[alive, 1] = next2[alive]
+
+        winners = np.full(self.games, ONGOING, dtype=np.int8)
+        winners[dead1 & dead2] = DRAW
+        winners[dead1 & ~dead2] = P2
+        winners[dead2 & ~dead1] = P1
+
+        done = ~alive
+        if done.any():
+            self.wins += np.bincount(winners[done], minlength=3)
+            self.lengths[done] = self.ticks[done]
+            self.reset(done)
+        return winners
+
+    def random_moves(self, rng):
+        """A random non-crashing move per game and player (UP if there is none)."""
+        free = self.free_moves()
+        # Random key per move, free moves always ranked above taken ones
+        keys = rng.random(free.shape) + free
+        return np.argmax(keys, axis=-1).astype(np.uint8)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batch simulator with random safe moves.")
+    parser.add_argument("--games", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    engine = BatchEngine(args.games, args.cols, args.rows)
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        moves = engine.random_moves(rng)
+        engine.step(moves[:, 0], moves[:, 1])
+    elapsed = time.perf_counter() - start
+
+    finished = int(engine.wins.sum())
+    print(f"{args.games} games x {args.steps} steps in {elapsed:.2f}s: "
+          f"{args.games * args.steps / elapsed:,.0f} game-steps/sec")
+    print(f"  {finished} rounds finished: P1 {engine.wins[P1]}  P2 {engine.wins[P2]}  DRAW {engine.wins[DRAW]}")
+
+if __name__ == "__main__":
+    main()
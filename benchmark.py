@@ -0,0 +1,347 @@
+import argparse
+import json
+import platform
+import queue
+import random
+import sys
+import time
+import timeit
+
+import numpy as np
+
+import endgame
+import maps
+import random_tron_bot
+import smart_tron_bot
+from batch_engine import BatchEngine
+from bitboard import Bitboard, flood, popcount
+from bot_driver import safe_move
+from flatboard import FlatBoard
+from tron_engine import TronEngine
+
+# --- MICRO-BENCHMARK: calculate_voronoi_territory on the 30x30 board ---
+# "before" is the original queue.Queue + set-of-tuples BFS, kept here
+# verbatim so the comparison stays honest as smart_tron_bot evolves.
+
+COLS = 30
+ROWS = 30
+
+def queue_voronoi_territory(grid, my_start, opp_start):
+    my_start = tuple(my_start)
+    opp_start = tuple(opp_start)
+
+    cols = len(grid)
+    rows = len(grid[0])
+
+    q = queue.Queue()
+    q.put((my_start[0], my_start[1], 1))
+    q.put((opp_start[0], opp_start[1], 2))
+
+    visited = set()
+    visited.add(my_start)
+    visited.add(opp_start)
+
+    my_territory = 0
+    iterations = 0
+    max_iterations = 2000
+
+    while not q.empty() and iterations < max_iterations:
+        cx, cy, owner = q.get()
+        iterations += 1
+
+        if owner == 1:
+            my_territory += 1
+
+        neighbors = [
+            (cx+1, cy), (cx-1, cy), (cx, cy+1), (cx, cy-1)
+        ]
+
+        for nx, ny in neighbors:
+            if 0 <= nx < cols and 0 <= ny < rows:
+                if grid[nx][ny] == 0 and (nx, ny) not in visited:
+                    visited.add((nx, ny))
+                    q.put((nx, ny, owner))
+
+    return my_territory
+
+def midgame_position(seed, ticks=40):
+    """Plays `ticks` random-bot moves from the standard start; returns the engine."""
+    random.seed(seed)
+    engine = TronEngine(COLS, ROWS)
+    for _ in range(ticks):
+        move1 = random_tron_bot.get_move(engine.grid, engine.p1_pos, 1, engine.p2_pos)
+        move2 = random_tron_bot.get_move(engine.grid, engine.p2_pos, 2, engine.p1_pos)
+        if engine.step(move1, move2) is not None:
+            break
+    return engine
+
+def time_per_call(fn, repeat=5, number=50):
+    """Best-of-`repeat` mean latency of fn() in microseconds."""
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number * 1e6
+
+def bench_voronoi():
+    positions = [("empty", TronEngine(COLS, ROWS))]
+    positions += [(f"midgame #{seed}", midgame_position(seed)) for seed in range(3)]
+
+    print(f"calculate_voronoi_territory, {COLS}x{ROWS}, us per call")
+    print(f"  {'position':<12} {'queue BFS':>10} {'ring BFS':>10} {'bitboard':>10}")
+    for name, engine in positions:
+        grid = engine.grid
+        board = Bitboard.from_grid(grid)
+        my_start = (engine.p1_pos[0], engine.p1_pos[1])
+        opp_start = (engine.p2_pos[0], engine.p2_pos[1])
+
+        expected = queue_voronoi_territory(grid, my_start, opp_start)
+        assert smart_tron_bot.calculate_voronoi_territory(grid, my_start, opp_start) == expected
+        assert smart_tron_bot.calculate_voronoi_territory(board, my_start, opp_start) == expected
+
+        before = time_per_call(lambda: queue_voronoi_territory(grid, my_start, opp_start), number=10)
+        ring = time_per_call(lambda: smart_tron_bot.calculate_voronoi_territory(grid, my_start, opp_start))
+        bits = time_per_call(lambda: smart_tron_bot.calculate_voronoi_territory(board, my_start, opp_start))
+        print(f"  {name:<12} {before:>10.1f} {ring:>10.1f} {bits:>10.1f}")
+
+# --- BENCHMARK SUITE ---
+# A fixed corpus of mid-game positions per board size. Both players play
+# a seeded space-filling walk (straight through open space, towards the
+# bigger region near trails) until CORPUS_FILL of the board is taken.
+# Seeds where a player crashes on the way, is left without a move or is
+# cut off from the other are skipped, so every position still runs the
+# Voronoi evaluators rather than the separated endgame. No wall clock or
+# global RNG is involved, so every run times exactly the same boards.
+# Results are one flat dict of "<size>/<benchmark>" -> {"value", "unit"}:
+# "us" is microseconds per call (lower is better), "steps/s" is
+# throughput (higher is better).
+
+SIZES = (30, 100, 300)
+CORPUS_POSITIONS = 3
+CORPUS_FILL = 0.2
+# Chance per tick of turning in open space
+CORPUS_TURN = 0.05
+# Seeds tried per size before giving up
+CORPUS_MAX_SEEDS = 100
+# Run time of each throughput measurement (latencies use timeit.autorange)
+MIN_SECONDS = 0.2
+REGRESSION_TOLERANCE = 0.10
+
+def _open_around(cells, idx, stride):
+    """Free cells among the 8 around a padded index."""
+    return sum(1 for offset in (-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1)
+               if cells[idx + offset] == 0)
+
+def _joined(cells, a, b, neighbors, limit=48):
+    """True if free cell `a` reaches `b` within `limit` cells (False may just mean "far")."""
+    seen = {a}
+    todo = [a]
+    for idx in todo:
+        for offset in neighbors:
+            n = idx + offset
+            if n == b:
+                return True
+            if cells[n] == 0 and n not in seen:
+                if len(seen) >= limit:
+                    return False
+                seen.add(n)
+                todo.append(n)
+    return False
+
+def _walk_move(board, pos, heading, rng):
+    """The corpus walk: keep heading through open space, else the move into the biggest region."""
+    cells = board.cells
+    here = board.index(pos[0], pos[1])
+    ahead = here + board.moves[heading]
+    if cells[ahead] == 0 and _open_around(cells, ahead, board.stride) == 8 and rng.random() > CORPUS_TURN:
+        return heading
+
+    options = [move for move, offset in board.moves.items() if cells[here + offset] == 0]
+    if len(options) < 2:
+        return options[0] if options else heading
+    targets = [here + board.moves[move] for move in options]
+    # Only flood when the moves might lead into different regions
+    if not all(_joined(cells, targets[0], target, board.neighbors) for target in targets[1:]):
+        bits = Bitboard.from_grid(board)
+        sizes = [popcount(flood(bits, bits.bit(*board.xy(target)))) for target in targets]
+        options = [move for move, size in zip(options, sizes) if size == max(sizes)]
+    most_open = max(_open_around(cells, here + board.moves[move], board.stride) for move in options)
+    return rng.choice([move for move in options
+                       if _open_around(cells, here + board.moves[move], board.stride) == most_open])
+
+def corpus_position(size, seed):
+    """(FlatBoard, p1_pos, p2_pos) with CORPUS_FILL of the board taken, or None if `seed` is skipped."""
+    rng = random.Random(seed)
+    engine = TronEngine(size, size)
+    headings = ["RIGHT", "LEFT"]
+    for _ in range(int(CORPUS_FILL * size * size) // 2):
+        headings = [_walk_move(engine.grid, engine.p1_pos, headings[0], rng),
+                    _walk_move(engine.grid, engine.p2_pos, headings[1], rng)]
+        if engine.step(*headings) is not None:
+            return None
+
+    board = engine.grid
+    for pos in (engine.p1_pos, engine.p2_pos):
+        here = board.index(pos[0], pos[1])
+        if all(board.cells[here + offset] != 0 for offset in board.neighbors):
+            return None
+    if endgame.is_separated(Bitboard.from_grid(board), engine.p1_pos, engine.p2_pos):
+        return None
+    return board, list(engine.p1_pos), list(engine.p2_pos)
+
+def corpus(size, count=CORPUS_POSITIONS):
+    """The first `count` positions of corpus_position over seeds 0, 1, 2..."""
+    positions = []
+    for seed in range(CORPUS_MAX_SEEDS):
+        position = corpus_position(size, seed)
+        if position is not None:
+            positions.append(position)
+            if len(positions) == count:
+                return positions
+    raise RuntimeError(f"only {len(positions)} usable corpus positions in {CORPUS_MAX_SEEDS} seeds at {size}x{size}")
+
+def measure(fn):
+    """Best-of-3 mean latency of fn() in microseconds, with an automatic call count."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed > 1.0:
+        return elapsed / number * 1e6  # slow call: one measurement is enough
+    return min(timer.repeat(repeat=3, number=number)) / number * 1e6
+
+def engine_steps_per_sec(size, seconds=MIN_SECONDS):
+    """TronEngine ticks/sec with a cheap safe-move policy, restarting finished rounds."""
+    engine = TronEngine(size, size)
+    ticks = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            grid = engine.grid
+            move1 = safe_move(grid, engine.p1_pos)
+            move2 = safe_move(grid, engine.p2_pos)
+            if engine.step(move1, move2) is not None:
+                engine.reset()
+            ticks += 1
+    return ticks / (time.perf_counter() - start)
+
+def batch_steps_per_sec(size, games=1024, seconds=MIN_SECONDS):
+    """BatchEngine game-steps/sec with vectorized random safe moves."""
+    rng = np.random.default_rng(0)
+    engine = BatchEngine(games, size, size)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        moves = engine.random_moves(rng)
+        engine.step(moves[:, 0], moves[:, 1])
+        steps += games
+    return steps / (time.perf_counter() - start)
+
+def run_suite(sizes=SIZES, log=print):
+    results = {}
+
+    def record(key, value, unit):
+        results[key] = {"value": value, "unit": unit}
+        log(f"  {key:<36} {value:>14,.1f} {unit}")
+
+    for size in sizes:
+        positions = corpus(size)
+        log(f"{size}x{size}: {len(positions)} positions")
+
+        def per_position(fn):
+            # Mean over the corpus of each position's per-call time
+            return sum(measure(lambda: fn(*position)) for position in positions) / len(positions)
+
+        packed = [(Bitboard.from_grid(grid), p1, p2) for grid, p1, p2 in positions]
+        for mode in ("bfs", "bitboard", "numpy"):
+            record(f"{size}/voronoi/{mode}", per_position(
+                lambda grid, p1, p2: smart_tron_bot.calculate_voronoi_territory(grid, p1, p2, mode)), "us")
+        record(f"{size}/voronoi/packed", sum(
+            measure(lambda: smart_tron_bot.calculate_voronoi_territory(board, p1, p2))
+            for board, p1, p2 in packed) / len(packed), "us")
+
+        # Free-for-all: every player's region in one pass, 8 players on an open board
+        ffa_board = FlatBoard(size, size)
+        ffa_starts = maps.default_starts(size, size, 8)
+        for player, (x, y) in enumerate(ffa_starts, 1):
+            ffa_board.set(x, y, player)
+        for mode in ("bfs", "bitboard", "numpy"):
+            record(f"{size}/voronoi_regions_8p/{mode}", measure(
+                lambda: smart_tron_bot.calculate_voronoi_regions(ffa_board, ffa_starts, mode)), "us")
+
+        record(f"{size}/count_open_neighbors/flat", per_position(
+            lambda grid, p1, p2: smart_tron_bot.count_open_neighbors(grid, p1[0], p1[1])), "us")
+        record(f"{size}/count_open_neighbors/packed", sum(
+            measure(lambda: smart_tron_bot.count_open_neighbors(board, p1[0], p1[1]))
+            for board, p1, p2 in packed) / len(packed), "us")
+
+        # Seeded, so the random bot and tie-breaks pick the same way every run
+        def seeded(get_move):
+            def call(grid, p1, p2):
+                random.seed(0)
+                return get_move(grid.copy(), list(p1), 1, list(p2))
+            return call
+
+        record(f"{size}/get_move/smart_tron_bot", per_position(seeded(smart_tron_bot.get_move)), "us")
+        record(f"{size}/get_move/random_tron_bot", per_position(seeded(random_tron_bot.get_move)), "us")
+
+        record(f"{size}/steps/engine", engine_steps_per_sec(size), "steps/s")
+        record(f"{size}/steps/batch", batch_steps_per_sec(size), "steps/s")
+    return results
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE, log=print):
+    """Prints new vs baseline per benchmark; returns the keys that got slower than `tolerance`."""
+    regressions = []
+    log(f"  {'benchmark':<36} {'baseline':>14} {'now':>14} {'change':>8}")
+    for key, entry in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]["value"]
+        now = entry["value"]
+        # Positive change = faster
+        if entry["unit"] == "us":
+            speedup = before / now if now else float("inf")
+        else:
+            speedup = now / before if before else float("inf")
+        flag = ""
+        if speedup < 1 / (1 + tolerance):
+            flag = "  SLOWER"
+            regressions.append(key)
+        log(f"  {key:<36} {before:>14,.1f} {now:>14,.1f} {speedup - 1:>+8.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="TRON benchmark suite.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--json", default=None, metavar="PATH", help="Write the results here")
+    parser.add_argument("--baseline", default=None, metavar="PATH",
+                        help="Compare against results saved with --json; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help="Allowed slowdown before a benchmark counts as a regression")
+    parser.add_argument("--queue-bfs", action="store_true",
+                        help="Only run the original queue BFS vs ring BFS vs bitboard table")
+    args = parser.parse_args()
+
+    if args.queue_bfs:
+        bench_voronoi()
+        return
+
+    results = run_suite(args.sizes)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.baseline} ({baseline['environment']['time']}):")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+import numpy as np
+
+from flatboard import FlatBoard
+
+# --- BITBOARD ---
+# The whole board packed into one Python int, one bit per cell.
+# Bit index is x * rows + y, the same order as grid.ravel() on the
+# (COLS, ROWS) arena grid, so a column of the board is `rows` adjacent bits.
+#
+#   y - 1 (UP)    -> shift right by 1     (mask out the wrap into the previous column)
+#   y + 1 (DOWN)  -> shift left by 1      (mask out the wrap into the next column)
+#   x - 1 (LEFT)  -> shift right by rows
+#   x + 1 (RIGHT) -> shift left by rows   (mask to the board)
+
+_mask_cache = {}
+
+def _masks(cols, rows):
+    """Returns (full, not_top, not_bottom) masks for a board size, cached."""
+    key = (cols, rows)
+    if key not in _mask_cache:
+        full = (1 << (cols * rows)) - 1
+        top = 0
+        for x in range(cols):
+            top |= 1 << (x * rows)
+        bottom = top << (rows - 1)
+        _mask_cache[key] = (full, full & ~top, full & ~bottom)
+    return _mask_cache[key]
+
+def popcount(bits):
+    return bin(bits).count("1")
+
+def checkerboard(cols, rows):
+    """Mask of the cells with (x + y) even, cached per board size."""
+    key = ("checkerboard", cols, rows)
+    if key not in _mask_cache:
+        # Binary digits column by column, lowest bit first
+        even = ("10" * rows)[:rows]
+        odd = ("01" * rows)[:rows]
+        digits = "".join(odd if x % 2 else even for x in range(cols))
+        _mask_cache[key] = int(digits[::-1], 2)
+    return _mask_cache[key]
+
+class Bitboard:
+    def __init__(self, cols, rows, occupied=0):
+        self.cols = cols
+        self.rows = rows
+        self.full, self.not_top, self.not_bottom = _masks(cols, rows)
+        self.occupied = occupied
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Packs an arena grid (any non-zero cell is occupied) into a Bitboard."""
+        cols = len(grid)
+        rows = len(grid[0])
+        if isinstance(grid, FlatBoard):
+            grid = grid.view
+        if isinstance(grid, np.ndarray):
+            packed = np.packbits(grid.ravel() != 0, bitorder="little")
+            return cls(cols, rows, int.from_bytes(packed.tobytes(), "little"))
+
+        occupied = 0
+        for x in range(cols):
+            column = grid[x]
+            for y in range(rows):
+                if column[y] != 0:
+                    occupied |= 1 << (x * rows + y)
+        return cls(cols, rows, occupied)
+
+    def copy(self):
+        return Bitboard(self.cols, self.rows, self.occupied)
+
+    @property
+    def free(self):
+        return self.full & ~self.occupied
+
+    def index(self, x, y):
+        return x * self.rows + y
+
+    def bit(self, x, y):
+        return 1 << int(x * self.rows + y)
+
+    def is_free(self, x, y):
+        if x < 0 or x >= self.cols or y < 0 or y >= self.rows:
+            return False
+        return not (self.occupied >> int(x * self.rows + y)) & 1
+
+    def occupy(self, x, y):
+        self.occupied |= 1 << int(x * self.rows + y)
+
+    # --- NEIGHBOR EXPANSION ---
+    # Each shift moves every set bit one cell at once and drops the bits
+    # that would fall off the board.
+
+    def shift_up(self, bits):
+        return (bits >> 1) & self.not_bottom
+
+    def shift_down(self, bits):
+        return (bits << 1) & self.not_top
+
+    def shift_left(self, bits):
+        return bits >> self.rows
+
+    def shift_right(self, bits):
+        return (bits << self.rows) & self.full
+
+    def neighbors(self, bits):
+        """All cells 4-adjacent to any set bit."""
+        rows = self.rows
+        return (((bits >> 1) & self.not_bottom)
+                | ((bits << 1) & self.not_top)
+                | (bits >> rows)
+                | ((bits << rows) & self.full))
+
+# --- WORD-PARALLEL VORONOI ---
+
+def voronoi(board, my_start, opp_start):
+    """
+    Simultaneous flood fill from both starts, one whole BFS layer per loop.
+    Returns (mine, theirs, contested): cells strictly closer to each start,
+    and cells both reach on the same layer (which count for neither side).
+    The start cells themselves are counted for their owners.
+    """
+    rows = board.rows
+    not_top = board.not_top
+    not_bottom = board.not_bottom
+    full = board.full
+    open_cells = board.free
+
+    my_front = board.bit(my_start[0], my_start[1])
+    opp_front = board.bit(opp_start[0], opp_start[1])
+    # Kept positive (open & ~claimed) so the loop never masks with a
+    # negative big int; claimed cells are always open, so ^= removes them.
+    unclaimed = open_cells & ~(my_front | opp_front)
+    mine = my_front
+    theirs = opp_front
+    contested = 0
+
+    while my_front or opp_front:
+        # Inlined board.neighbors() for both frontiers
+        my_new = (((my_front >> 1) & not_bottom) | ((my_front << 1) & not_top)
+                  | (my_front >> rows) | ((my_front << rows) & full)) & unclaimed
+        opp_new = (((opp_front >> 1) & not_bottom) | ((opp_front << 1) & not_top)
+                   | (opp_front >> rows) | ((opp_front << rows) & full)) & unclaimed
+
+        tie = my_new & opp_new
+        mine |= my_new ^ tie
+        theirs |= opp_new ^ tie
+        contested |= tie
+        unclaimed ^= my_new | opp_new
+
+        # Tied cells keep growing for both sides
+        my_front = my_new
+        opp_front = opp_new
+
+    return popcount(mine), popcount(theirs), popcount(contested)
+
+def voronoi_batch(board, starts, opp_start, opp_layers=None, settled=False):
+    """
+    Territory (strictly closer + tied cells) for several candidate starts
+    against one opponent, in a single layered pass.
+    The opponent's reach does not depend on which candidate we pick, so it
+    is grown once and shared; each candidate only grows its own frontier,
+    and only through cells the opponent has not already reached.
+    `opp_layers` (DistanceLayers.layers for this board) skips growing the
+    opponent altogether.
+    Returns one count per start, equal to voronoi()'s mine + contested.
+    With `settled`, returns (counts, settled): settled is, per start, the
+    cells either side reaches, voronoi()'s mine + theirs + contested.
+    """
+    rows = board.rows
+    not_top = board.not_top
+    not_bottom = board.not_bottom
+    full = board.full
+    open_cells = board.free
+
+    fronts = [board.bit(x, y) for x, y in starts]
+    # Per-candidate open cells not yet seen; positive masks updated with ^=
+    remaining = [open_cells & ~front for front in fronts]
+    initial = list(remaining)
+
+    opp_front = board.bit(opp_start[0], opp_start[1])
+    opp_unreached = open_cells & ~opp_front
+    layer = 0
+
+    active = len(starts)
+    while active:
+        # Candidates claim layer d against the opponent's reach at d - 1
+        active = 0
+        for i, front in enumerate(fronts):
+            if not front:
+                continue
+            new = (((front >> 1) & not_bottom) | ((front << 1) & not_top)
+                   | (front >> rows) | ((front << rows) & full)) & remaining[i] & opp_unreached
+            fronts[i] = new
+            if new:
+                remaining[i] ^= new
+                active += 1
+
+        layer += 1
+        if opp_layers is not None:
+            if layer < len(opp_layers):
+                opp_unreached ^= opp_layers[layer]
+        elif opp_front:
+            opp_front = (((opp_front >> 1) & not_bottom) | ((opp_front << 1) & not_top)
+                         | (opp_front >> rows) | ((opp_front << rows) & full)) & opp_unreached
+            opp_unreached ^= opp_front
+
+    # Start cell + every cell claimed since
+    counts = [1 + popcount(before ^ after) for before, after in zip(initial, remaining)]
+    if not settled:
+        return counts
+
+    # The rest of the opponent's reach, which the candidates stopped short of
+    if opp_layers is not None:
+        for cells in opp_layers[layer + 1:]:
+            opp_unreached ^= cells
+    else:
+        while opp_front:
+            opp_front = (((opp_front >> 1) & not_bottom) | ((opp_front << 1) & not_top)
+                         | (opp_front >> rows) | ((opp_front << rows) & full)) & opp_unreached
+            opp_unreached ^= opp_front
+    opp_reached = open_cells ^ opp_unreached
+    # Whatever a candidate could not claim the opponent did; +1 for their head
+    return counts, [1 + popcount((before ^ after) | opp_reached | board.bit(x, y))
+                    for before, after, (x, y) in zip(initial, remaining, starts)]
+
+def voronoi_regions(board, starts, settled=False):
+    """
+    Voronoi split between any number of players in one layered flood.
+    Every player grows its own frontier, but all of them claim cells from
+    one shared unclaimed mask, so a layer costs one expansion per player
+    however many rivals there are (rather than a flood per pair).
+    Returns (closest, tied): per start, the cells strictly closer to it
+    than to any other start, and the cells it reaches on the same layer
+    as at least one other start. With two starts this is voronoi():
+    closest == [mine, theirs] and tied == [contested, contested].
+    `settled` appends the number of cells any start reached (tied ones once).
+    """
+    rows = board.rows
+    not_top = board.not_top
+    not_bottom = board.not_bottom
+    full = board.full
+
+    fronts = [board.bit(x, y) for x, y in starts]
+    reached = list(fronts)
+    unclaimed = board.free
+    for front in fronts:
+        unclaimed &= ~front
+    contested = 0
+
+    while True:
+        seen = 0
+        tie = 0
+        for i, front in enumerate(fronts):
+            if not front:
+                continue
+            new = (((front >> 1) & not_bottom) | ((front << 1) & not_top)
+                   | (front >> rows) | ((front << rows) & full)) & unclaimed
+            tie |= seen & new
+            seen |= new
+            fronts[i] = new
+            reached[i] |= new
+        if not seen:
+            break
+        contested |= tie
+        # Tied cells keep growing for every side that reached them
+        unclaimed ^= seen
+
+    closest = [popcount(cells & ~contested) for cells in reached]
+    tied = [popcount(cells & contested) for cells in reached]
+    if settled:
+        everyone = 0
+        for cells in reached:
+            everyone |= cells
+        return closest, tied, popcount(everyone)
+    return closest, tied
+
+# --- INCREMENTAL DISTANCE LAYERS ---
+
+class DistanceLayers:
+    """
+    BFS distance field from one source, stored as one bitmask per distance
+    (layers[d] = free cells exactly d steps away; layers[0] is the source).
+    advance() repairs it after the source steps to an adjacent cell and
+    some cells get blocked, touching only the layers that lost support.
+    `repaired` is the number of cells re-layered by the last update.
+    """
+    def __init__(self, board, source):
+        self.repaired = 0
+        self.recompute(board, source)
+
+    def recompute(self, board, source):
+        rows = board.rows
+        not_top = board.not_top
+        not_bottom = board.not_bottom
+        full = board.full
+
+        front = board.bit(source[0], source[1])
+        self.layers = [front]
+        unreached = board.free & ~front
+        while True:
+            front = (((front >> 1) & not_bottom) | ((front << 1) & not_top)
+                     | (front >> rows) | ((front << rows) & full)) & unreached
+            if not front:
+                break
+            unreached ^= front
+            self.layers.append(front)
+        self.repaired = board.cols * board.rows
+
+    def advance(self, board, new_source, blocked):
+        """
+        Moves the source to `new_source` (a neighbour of the old one) and
+        removes the `blocked` bits from the field.
+        Distances can only grow, except that everything still reached
+        through the new source gets one step closer. That part is handled
+        by dropping layer 0. Cells left without a parent one layer closer
+        are invalidated and re-layered from their valid neighbours.
+        """
+        layers = self.layers
+        src = board.bit(new_source[0], new_source[1])
+        if len(layers) < 2 or not layers[1] & src:
+            self.recompute(board, new_source)
+            return
+
+        rows = board.rows
+        not_top = board.not_top
+        not_bottom = board.not_bottom
+        full = board.full
+
+        # Shift every distance down by one. Any other cell of the old
+        # layer 1 (a free sibling of the new source) is orphaned along with
+        # everything behind it - in open play about half the field, where a
+        # fresh flood is cheaper than invalidating and re-layering it.
+        if layers[1] & ~src:
+            self.recompute(board, new_source)
+            return
+        del layers[0]
+        affected = 0
+        layers[0] = src
+
+        # Clear blocked cells out of their layers; those layers are roots
+        # of the invalidation.
+        blocked &= ~src
+        roots = set()
+        if blocked:
+            for d in range(1, len(layers)):
+                if layers[d] & blocked:
+                    layers[d] &= ~blocked
+                    roots.add(d)
+
+        # Invalidate, layer by layer, cells with no valid parent one step
+        # closer. Layers whose parent layer did not change are skipped.
+        # Repairing costs about two floods per invalidated layer, so once
+        # the damage spans half the field a fresh flood is cheaper.
+        budget = len(layers) // 2
+        prev_changed = False
+        first = None
+        for d in range(1, len(layers)):
+            if not prev_changed and (d - 1) not in roots:
+                continue
+            budget -= 1
+            if budget < 0:
+                self.recompute(board, new_source)
+                return
+            parents = layers[d - 1]
+            orphans = layers[d] & ~(((parents >> 1) & not_bottom) | ((parents << 1) & not_top)
+                                    | (parents >> rows) | ((parents << rows) & full))
+            prev_changed = bool(orphans)
+            if orphans:
+                layers[d] ^= orphans
+                affected |= orphans
+                if first is None:
+                    first = d
+
+        self.repaired = popcount(affected)
+
+        # Re-layer the invalidated cells from the surviving field
+        if affected:
+            d = first
+            while affected and d - 1 < len(layers) and layers[d - 1]:
+                parents = layers[d - 1]
+                new = (((parents >> 1) & not_bottom) | ((parents << 1) & not_top)
+                       | (parents >> rows) | ((parents << rows) & full)) & affected
+                if new:
+                    if d == len(layers):
+                        layers.append(new)
+                    else:
+                        layers[d] |= new
+                    affected ^= new
+                d += 1
+            # Whatever is left is no longer reachable at all
+
+        while len(layers) > 1 and not layers[-1]:
+            layers.pop()
+
+def flood(board, seeds, open_cells=None):
+    """All cells connected to `seeds` through `open_cells` (default: free cells)."""
+    if open_cells is None:
+        open_cells = board.free
+    rows = board.rows
+    not_top = board.not_top
+    not_bottom = board.not_bottom
+    full = board.full
+
+    front = seeds & open_cells
+    remaining = open_cells ^ front
+    while front:
+        front = (((front >> 1) & not_bottom) | ((front << 1) & not_top)
+                 | (front >> rows) | ((front << rows) & full)) & remaining
+        remaining ^= front
+    return open_cells ^ remaining
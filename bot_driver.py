@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from flatboard import FlatBoard
+
+# --- ASYNC BOT DRIVER ---
+# Runs a bot on a background worker so a front-end's frame loop never
+# waits for it. The bot starts thinking as soon as a step
+# has been applied and the move is collected at the next step's deadline;
+# if it is not ready by then, a cheap safe move is played instead.
+
+def safe_move(grid, my_pos):
+    """The non-crashing move with the most open cells around it ("UP" if none)."""
+    board = grid if isinstance(grid, FlatBoard) else FlatBoard.from_grid(grid)
+    cells = board.cells
+    here = board.index(my_pos[0], my_pos[1])
+    best_move = "UP"
+    best_open = -1
+    for move, offset in board.moves.items():
+        step = here + offset
+        if cells[step] != 0:
+            continue
+        open_cells = sum(1 for n in board.neighbors if cells[step + n] == 0)
+        if open_cells > best_open:
+            best_open = open_cells
+            best_move = move
+    return best_move
+
+# Worker-side helpers: a process worker gets its own copy of the bot once
+# (executor initializer) and the calls below find it there.
+_installed = None
+
+def _install(player):
+    global _installed
+    _installed = player
+
+def _start(player, grid, my_pos, my_id, opp_pos):
+    (player or _installed).start(grid, my_pos, my_id, opp_pos)
+
+def _advance(player, ticks):
+    """Replays any ticks the bot missed while busy, then steps on the last one."""
+    player = player or _installed
+    for my_pos, opp_pos in ticks[:-1]:
+        player.update(my_pos, opp_pos)
+    return player.step(*ticks[-1])
+
+class AsyncBot:
+    """
+    One delta-API bot (see tron_engine) on one background worker.
+      new_round(grid, my_pos, my_id, opp_pos) - bot.start() for a new round
+      think(grid, my_pos, opp_pos)            - begin thinking about the next move
+      result()                                - the move if ready, else the fallback
+    Calls run in order on the worker. While the bot is still busy with an
+    old move, new ticks are queued rather than piled up behind it and are
+    handed over with update() before its next step(), so it never misses
+    a cell. use_process=True moves the bot into its own process (no GIL
+    contention with the render loop; the bot must be picklable).
+    `timeouts` counts moves that fell back to safe_move.
+    """
+    def __init__(self, player, use_process=False):
+        if use_process:
+            self.executor = ProcessPoolExecutor(max_workers=1, initializer=_install,
+                                                initargs=(player,))
+            self.player = None
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+            self.player = player
+        self.future = None
+        self.current = False
+        self.pending = []
+        self.fallback = "UP"
+        self.timeouts = 0
+
+    def new_round(self, grid, my_pos, my_id, opp_pos):
+        self.pending = []
+        self.current = False
+        self.future = None
+        self.executor.submit(_start, self.player, grid.copy(), list(my_pos), my_id, list(opp_pos))
+
+    def think(self, grid, my_pos, opp_pos):
+        """`grid` is only used for the fallback move; the bot tracks its own board."""
+        self.fallback = safe_move(grid, my_pos)
+        self.pending.append((list(my_pos), list(opp_pos)))
+        if self.future is None or self.future.done():
+            self.future = self.executor.submit(_advance, self.player, self.pending)
+            self.pending = []
+            self.current = True
+        else:
+            self.current = False
+
+    def result(self, timeout=0):
+        """Waits at most `timeout` seconds, then falls back to the safe move."""
+        if not self.current:
+            self.timeouts += 1
+            return self.fallback
+        self.current = False
+        try:
+            return self.future.result(timeout=timeout)
+        except Exception:
+            # Still thinking (TimeoutError) or the bot itself crashed
+            self.timeouts += 1
+            return self.fallback
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,242 @@
+import atexit
+import importlib
+import queue
+import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from flatboard import FlatBoard
+from tron_engine import FreeForAllGridBot, GridBot
+
+# --- BOT LOADER ---
+# Bots are modules with an Arena-standard get_move(grid, my_pos, my_id,
+# opp_pos) and, optionally, a delta-API `Bot` class (see tron_engine).
+# load_player() either builds one in this process or starts it in its own
+# persistent subprocess (one per bot, kept warm across rounds), driven
+# over stdin/stdout with a compact binary protocol that mirrors the
+# delta API, so after the board sync a tick is just the two heads:
+#
+#   parent -> bot   b"S" cols:u16 rows:u16 seed:u32 my_id:u8 mx:u16 my:u16
+#                       ox:u16 oy:u16 cells:u8[cols*rows]      start()
+#                   b"U" mx:u16 my:u16 ox:u16 oy:u16           update()
+#                   b"M" seq:u32 mx:u16 my:u16 ox:u16 oy:u16   step()
+#   bot -> parent   seq:u32 move:u8   (index into MOVES, 255 = no move)
+#
+# Little-endian throughout; cells are in grid.ravel() order (x * rows + y).
+# The worker replies once with seq 0 when the bot module has been imported.
+
+MOVES = ("UP", "DOWN", "LEFT", "RIGHT")
+NO_MOVE = 255
+
+# Default per-move limit for isolated bots, in seconds
+TIME_LIMIT = 0.5
+# Time allowed for a worker to start and import its bot
+STARTUP_LIMIT = 30.0
+
+_SYNC = struct.Struct("<cHHIBHHHH")
+_UPDATE = struct.Struct("<cHHHH")
+_REQUEST = struct.Struct("<cIHHHH")
+_REPLY = struct.Struct("<IB")
+
+def load_player(name, isolated=False, time_limit=TIME_LIMIT):
+    """
+    A new delta-API player for the bot module `name`: its `Bot` if it has
+    one, else its get_move wrapped in GridBot; isolated in a BotProcess.
+    """
+    if isolated:
+        return BotProcess(name, time_limit)
+    module = importlib.import_module(name)
+    if hasattr(module, "Bot"):
+        return module.Bot()
+    return GridBot(module.get_move)
+
+def load_ffa_player(name):
+    """
+    A new free-for-all delta-API player (see tron_engine) for the bot
+    module `name`: its `FreeForAllBot` if it has one, else its
+    get_ffa_move or two-player get_move wrapped in FreeForAllGridBot.
+    Always in-process; the subprocess protocol is two-player only.
+    """
+    module = importlib.import_module(name)
+    if hasattr(module, "FreeForAllBot"):
+        return module.FreeForAllBot()
+    return FreeForAllGridBot(module.get_move, getattr(module, "get_ffa_move", None))
+
+class BotProcess:
+    """
+    One bot in its own subprocess, driven through the delta API
+    (start/update/step); step() is request() + collect(), which can be
+    split to let several bots think at the same time. get_move() keeps
+    the Arena-standard call working on top of that.
+    A move that misses the time limit (or a crashed worker) comes back as
+    None, which the engine treats as a crash: a timeout forfeits the round.
+    The late worker is killed and a fresh one started with the next
+    round. `timeouts` counts those forfeits.
+    """
+    def __init__(self, name, time_limit=TIME_LIMIT):
+        self.name = name
+        self.time_limit = time_limit
+        self.timeouts = 0
+        self.process = None
+        self.seq = 0
+        self.spawn()
+        atexit.register(self.close)
+
+    def spawn(self):
+        self.close()
+        self.process = subprocess.Popen(
+            [sys.executable, __file__, self.name],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.replies = queue.Queue()
+        reader = threading.Thread(target=self._read_replies,
+                                  args=(self.process.stdout, self.replies), daemon=True)
+        reader.start()
+        self.mirror = None
+        if self._wait(0, STARTUP_LIMIT) is None:
+            raise RuntimeError(f"bot {self.name!r} failed to start")
+
+    @staticmethod
+    def _read_replies(stream, replies):
+        while True:
+            data = stream.read(_REPLY.size)
+            if len(data) < _REPLY.size:
+                replies.put(None)  # worker exited
+                return
+            replies.put(_REPLY.unpack(data))
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=1)
+            except Exception:
+                self.process.kill()
+        self.process = None
+
+    def _send(self, message):
+        try:
+            self.process.stdin.write(message)
+            self.process.stdin.flush()
+        except (OSError, AttributeError):
+            pass  # worker died; the next collect() reports the forfeit
+
+    def start(self, grid, my_pos, my_id, opp_pos):
+        if self.process is None or self.process.poll() is not None:
+            self.spawn()
+        cols, rows = len(grid), len(grid[0])
+        # Seeded from our own generator, so seeded tournaments replay
+        seed = random.getrandbits(32)
+        cells = np.asarray(grid).astype(np.uint8).tobytes()
+        self._send(_SYNC.pack(b"S", cols, rows, seed, my_id, my_pos[0], my_pos[1],
+                              opp_pos[0], opp_pos[1]) + cells)
+
+    def update(self, my_pos, opp_pos):
+        self._send(_UPDATE.pack(b"U", my_pos[0], my_pos[1], opp_pos[0], opp_pos[1]))
+
+    def request(self, my_pos, opp_pos):
+        """Asks for a move; the reply is picked up by collect()."""
+        self.seq += 1
+        self.deadline = time.perf_counter() + self.time_limit
+        if self.process is None:
+            return  # killed after a timeout; forfeits until the next start()
+        self._send(_REQUEST.pack(b"M", self.seq, my_pos[0], my_pos[1], opp_pos[0], opp_pos[1]))
+
+    def collect(self):
+        """The requested move, or None if it missed the deadline."""
+        move = None
+        if self.process is not None:
+            move = self._wait(self.seq, self.deadline - time.perf_counter())
+        if move is None:
+            self.timeouts += 1
+            # Still busy with a move nobody will use: restart it, so the next
+            # round does not queue behind the stale one.
+            if self.process is not None:
+                self.process.kill()
+                self.process = None
+            return None
+        return MOVES[move] if move < len(MOVES) else None
+
+    def _wait(self, seq, timeout):
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            try:
+                reply = self.replies.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                return None
+            if reply is None:
+                self.process = None
+                return None
+            # Late answers to earlier requests are dropped
+            if reply[0] == seq:
+                return reply[1]
+
+    def step(self, my_pos, opp_pos):
+        self.request(my_pos, opp_pos)
+        return self.collect()
+
+    def get_move(self, grid, my_pos, my_id, opp_pos):
+        """Arena-standard call: restarts the round whenever cells were cleared."""
+        cells = np.asarray(grid) != 0
+        mirror = self.mirror
+        if mirror is None or mirror.shape != cells.shape or (mirror & ~cells).any():
+            self.start(grid, my_pos, my_id, opp_pos)
+        self.mirror = cells
+        return self.step(my_pos, opp_pos)
+
+# --- WORKER SIDE ---
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError
+    return data
+
+def serve(name):
+    """Worker loop: runs bot module `name` until stdin closes."""
+    inp = sys.stdin.buffer
+    out = sys.stdout.buffer
+    # Anything the bot prints goes to stderr, not into the protocol
+    sys.stdout = sys.stderr
+
+    player = load_player(name)
+    out.write(_REPLY.pack(0, NO_MOVE))
+    out.flush()
+
+    try:
+        while True:
+            kind = _read_exact(inp, 1)
+            if kind == b"S":
+                _, cols, rows, seed, my_id, mx, my, ox, oy = _SYNC.unpack(
+                    kind + _read_exact(inp, _SYNC.size - 1))
+                cells = np.frombuffer(_read_exact(inp, cols * rows), dtype=np.uint8)
+                grid = FlatBoard(cols, rows)
+                grid.view[:, :] = cells.reshape(cols, rows)
+                random.seed(seed)
+                np.random.seed(seed)
+                player.start(grid, [mx, my], my_id, [ox, oy])
+            elif kind == b"U":
+                _, mx, my, ox, oy = _UPDATE.unpack(kind + _read_exact(inp, _UPDATE.size - 1))
+                player.update([mx, my], [ox, oy])
+            elif kind == b"M":
+                _, seq, mx, my, ox, oy = _REQUEST.unpack(kind + _read_exact(inp, _REQUEST.size - 1))
+                try:
+                    move = MOVES.index(player.step([mx, my], [ox, oy]))
+                except Exception:
+                    traceback.print_exc()
+                    move = NO_MOVE
+                out.write(_REPLY.pack(seq, move))
+                out.flush()
+            else:
+                return
+    except EOFError:
+        return
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
@@ -0,0 +1,138 @@
+import numpy as np
+
+from bitboard import Bitboard
+from flatboard import FlatBoard
+
+# --- CHAMBER ANALYSIS ---
+# Biconnected components ("chambers") and articulation points of the
+# free-cell graph, found with an iterative Tarjan DFS (no recursion limit
+# on big boards). Rooting the DFS at the bot's head gives, in one
+# O(cells) pass, how much space each move can actually reach and fill:
+# a chamber is entered through one articulation point and only one of
+# the chambers hanging off it can be filled afterwards.
+
+def _free_mask(grid):
+    """
+    (free, board): one byte per cell, 1 where free, in the padded layout of
+    flatboard.FlatBoard (the border reads as blocked), plus a FlatBoard of
+    the right size for index arithmetic.
+    """
+    if isinstance(grid, Bitboard):
+        board = FlatBoard(grid.cols, grid.rows)
+        size = grid.cols * grid.rows
+        packed = grid.occupied.to_bytes((size + 7) // 8, "little")
+        bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), bitorder="little")
+        board.view[:, :] = bits[:size].reshape(grid.cols, grid.rows)
+    elif isinstance(grid, FlatBoard):
+        board = grid
+    else:
+        board = FlatBoard.from_grid(grid)
+    return bytearray((board.array == 0).tobytes()), board
+
+class ChamberAnalysis:
+    """
+    Result of analyze():
+      articulation - set of (x, y) cut cells in the analyzed region
+      chambers     - list of chambers, each a list of (x, y) cells
+                     (articulation cells appear in every chamber they join)
+      move_sizes   - {(x, y): cells fillable after stepping onto that
+                     neighbour of the root}
+    """
+    def __init__(self):
+        self.articulation = set()
+        self.chambers = []
+        self.move_sizes = {}
+
+def analyze(grid, root, collect=True):
+    """
+    Iterative Tarjan over the free cells reachable from `root` (usually the
+    bot's own head, which is occupied and is treated as the DFS root).
+    With collect=False only move_sizes is filled in (cheaper per tick).
+    """
+    free, board = _free_mask(grid)
+    size = len(free)
+    offsets = board.neighbors
+
+    result = ChamberAnalysis()
+    rx, ry = root
+    root = board.index(rx, ry)
+    # Padded indices: the wall border is never free, so no bounds checks
+    root_neighbors = set(root + offset for offset in offsets if free[root + offset])
+
+    # The (occupied) root is still a vertex: back edges to it count
+    free[root] = 1
+
+    disc = [0] * size
+    low = [0] * size
+    # best[u]: largest chamber value hanging below cut cell u
+    best = [0] * size
+    cells = []
+
+    disc[root] = low[root] = 1
+    clock = 1
+    root_children = 0
+    # DFS frames: [vertex, next direction 0..3]
+    stack = [[root, 0]]
+
+    while stack:
+        frame = stack[-1]
+        v = frame[0]
+        k = frame[1]
+        if k < 4:
+            frame[1] = k + 1
+            w = v + offsets[k]
+            if not free[w]:
+                continue
+            if disc[w] == 0:
+                clock += 1
+                disc[w] = low[w] = clock
+                cells.append(w)
+                stack.append([w, 0])
+                if v == root:
+                    root_children += 1
+            elif disc[w] < low[v]:
+                low[v] = disc[w]
+            continue
+
+        stack.pop()
+        if not stack:
+            break
+        p = stack[-1][0]
+        if low[v] < low[p]:
+            low[p] = low[v]
+        if low[v] < disc[p]:
+            continue
+
+        # p cuts v's subtree off: everything above v on the cell stack
+        # forms one chamber together with p.
+        chamber = []
+        extra = 0
+        while True:
+            u = cells.pop()
+            chamber.append(u)
+            if best[u] > extra:
+                extra = best[u]
+            if u == v:
+                break
+        value = len(chamber) + extra
+        if value > best[p]:
+            best[p] = value
+
+        if p == root:
+            for u in chamber:
+                if u in root_neighbors:
+                    result.move_sizes[board.xy(u)] = value
+        if collect:
+            if p != root:
+                result.articulation.add(board.xy(p))
+            chamber.append(p)
+            result.chambers.append([board.xy(u) for u in chamber])
+
+    # The root only cuts the graph if the DFS left it more than once
+    if collect and root_children > 1:
+        result.articulation.add((rx, ry))
+    return result
+
+def chamber_sizes(grid, head):
+    """{(x, y): fillable cells} for every free neighbour of `head`."""
+    return analyze(grid, head, collect=False).move_sizes
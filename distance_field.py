@@ -0,0 +1,161 @@
+import numpy as np
+
+# --- VECTORIZED DISTANCE FIELDS ---
+# BFS distances computed by dilating a boolean frontier over the whole
+# board with NumPy slicing: one vectorized pass per BFS layer, so the Python
+# loop runs board-diameter times instead of once per cell.
+
+UNREACHED = np.iinfo(np.int32).max
+
+def dilate(frontier, out=None):
+    """Cells 4-adjacent to any True cell of `frontier` (2D bool array)."""
+    if out is None:
+        out = np.zeros_like(frontier)
+    else:
+        out.fill(False)
+    out[1:, :] |= frontier[:-1, :]
+    out[:-1, :] |= frontier[1:, :]
+    out[:, 1:] |= frontier[:, :-1]
+    out[:, :-1] |= frontier[:, 1:]
+    return out
+
+def distance_field(open_mask, start):
+    """
+    Step distance from `start` to every cell reachable through `open_mask`.
+    The start itself is always distance 0; unreachable cells are UNREACHED.
+    """
+    dist = np.full(open_mask.shape, UNREACHED, dtype=np.int32)
+    frontier = np.zeros(open_mask.shape, dtype=bool)
+    frontier[start[0], start[1]] = True
+    dist[start[0], start[1]] = 0
+
+    # 'unreached' shrinks as layers are claimed; buffers are reused per layer
+    unreached = open_mask.copy()
+    unreached[start[0], start[1]] = False
+    grown = np.empty_like(frontier)
+
+    layer = 0
+    while True:
+        dilate(frontier, out=grown)
+        np.logical_and(grown, unreached, out=frontier)
+        if not frontier.any():
+            break
+        layer += 1
+        unreached ^= frontier
+        np.putmask(dist, frontier, layer)
+    return dist
+
+def voronoi_counts(grid, my_start, opp_start):
+    """
+    Uncapped Voronoi split of the board from two distance fields.
+    Returns (mine, theirs, contested) like bitboard.voronoi.
+    """
+    open_mask = np.asarray(grid) == 0
+    my_dist = distance_field(open_mask, my_start)
+    opp_dist = distance_field(open_mask, opp_start)
+
+    mine = np.count_nonzero(my_dist < opp_dist)
+    theirs = np.count_nonzero(opp_dist < my_dist)
+    contested = np.count_nonzero((my_dist == opp_dist) & (my_dist != UNREACHED))
+    return int(mine), int(theirs), int(contested)
+
+def distance_fields(open_mask, starts):
+    """
+    Stacked distance_field for several starts: returns a (len(starts), W, H)
+    array, with every start's frontier dilated in the same vectorized pass.
+    """
+    count = len(starts)
+    shape = (count,) + open_mask.shape
+    dist = np.full(shape, UNREACHED, dtype=np.int32)
+    frontier = np.zeros(shape, dtype=bool)
+    unreached = np.broadcast_to(open_mask, shape).copy()
+    for i, (x, y) in enumerate(starts):
+        frontier[i, x, y] = True
+        dist[i, x, y] = 0
+        unreached[i, x, y] = False
+    grown = np.empty_like(frontier)
+
+    layer = 0
+    while True:
+        grown.fill(False)
+        grown[:, 1:, :] |= frontier[:, :-1, :]
+        grown[:, :-1, :] |= frontier[:, 1:, :]
+        grown[:, :, 1:] |= frontier[:, :, :-1]
+        grown[:, :, :-1] |= frontier[:, :, 1:]
+        np.logical_and(grown, unreached, out=frontier)
+        if not frontier.any():
+            break
+        layer += 1
+        unreached ^= frontier
+        np.putmask(dist, frontier, layer)
+    return dist
+
+def voronoi_batch(grid, starts, opp_start, settled=False):
+    """
+    Territory (strictly closer + tied cells) for several candidate starts.
+    The opponent's field is computed once and compared against every
+    candidate's field. Returns one count per start, or (counts, settled)
+    like bitboard.voronoi_batch.
+    """
+    open_mask = np.asarray(grid) == 0
+    opp_dist = distance_field(open_mask, opp_start)
+    my_dist = distance_fields(open_mask, starts)
+
+    owned = (my_dist <= opp_dist) & (my_dist != UNREACHED)
+    counts = [int(n) for n in owned.reshape(len(starts), -1).sum(axis=1)]
+    if not settled:
+        return counts
+    reached = (my_dist != UNREACHED) | (opp_dist != UNREACHED)
+    return counts, [int(n) for n in reached.reshape(len(starts), -1).sum(axis=1)]
+
+# Owner bitmasks naming more than one start
+_MASKS = np.arange(256)
+_SHARED = np.array([bin(m).count("1") > 1 for m in range(256)])
+
+def voronoi_regions(grid, starts, settled=False):
+    """
+    Voronoi split between up to 8 starts in one vectorized pass: every
+    cell holds a bitmask of the starts that reached it first, so a layer
+    is the same handful of array operations however many players there are.
+    Returns (closest, tied) like bitboard.voronoi_regions, and the same
+    settled count.
+    """
+    if len(starts) > 8:
+        raise ValueError("voronoi_regions supports at most 8 starts")
+    open_mask = np.asarray(grid) == 0
+    owners = np.zeros(open_mask.shape, dtype=np.uint8)
+    frontier = np.zeros(open_mask.shape, dtype=np.uint8)
+    for i, (x, y) in enumerate(starts):
+        frontier[x, y] = 1 << i
+    owners |= frontier
+    unreached = open_mask & (owners == 0)
+    grown = np.empty_like(frontier)
+
+    while True:
+        # A cell's new owners are every owner of its neighbours on this layer
+        grown.fill(0)
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        grown *= unreached
+        if not grown.any():
+            break
+        owners |= grown
+        unreached &= grown == 0
+        frontier, grown = grown, frontier
+
+    return owner_counts(owners, len(starts), settled)
+
+def owner_counts(owners, players, settled=False):
+    """
+    (closest, tied) per player from an array of owner bitmasks (bit i set:
+    start i reached the cell first), via one histogram of the masks.
+    `settled` appends the number of cells with any owner.
+    """
+    masks = np.bincount(np.asarray(owners).ravel(), minlength=256)
+    closest = [int(masks[1 << i]) for i in range(players)]
+    tied = [int(masks[_SHARED & (_MASKS & (1 << i) != 0)].sum()) for i in range(players)]
+    if settled:
+        return closest, tied, int(masks[1:].sum())
+    return closest, tied
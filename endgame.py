@@ -0,0 +1,147 @@
+import time
+
+from bitboard import checkerboard, flood, popcount
+
+# --- SEPARATED ENDGAME ---
+# Once the two players can no longer reach each other, territory is
+# settled and the only question left is how much of my own region I can
+# fill before running out of room. That is a longest-path problem: searched
+# here with a bounded DFS over bitmasks, memoized on (head, free cells),
+# with a checkerboard parity bound as both the leaf estimate and the
+# "cannot do better" cut-off.
+
+# Search limits per call to fill_move
+FILL_DEPTH = 12
+FILL_NODES = 400
+
+MOVES = ("UP", "DOWN", "LEFT", "RIGHT")
+
+def is_separated(board, my_pos, opp_pos, deadline=None):
+    """
+    True when no free cell reachable from my head touches the opponent's head.
+    The flood stops at the first layer that touches them. Past `deadline`
+    (a time.perf_counter() value) it gives up and answers False: still in
+    contact, as far as it could tell.
+    """
+    rows = board.rows
+    not_top = board.not_top
+    not_bottom = board.not_bottom
+    full = board.full
+
+    contact = board.neighbors(board.bit(opp_pos[0], opp_pos[1]))
+    remaining = board.free
+    front = board.neighbors(board.bit(my_pos[0], my_pos[1])) & remaining
+    remaining ^= front
+    while front:
+        if front & contact:
+            return False
+        if deadline is not None and time.perf_counter() > deadline:
+            return False
+        front = (((front >> 1) & not_bottom) | ((front << 1) & not_top)
+                 | (front >> rows) | ((front << rows) & full)) & remaining
+        remaining ^= front
+    return True
+
+def is_isolated(board, my_pos, opp_positions):
+    """is_separated() against several opponents: no free cell I can reach touches any of their heads."""
+    heads = 0
+    for x, y in opp_positions:
+        heads |= board.bit(x, y)
+    region = flood(board, board.neighbors(board.bit(my_pos[0], my_pos[1])))
+    return not region & board.neighbors(heads)
+
+def parity_bound(board, start, region):
+    """
+    Longest path that can start on the `start` bit and stay inside
+    `region` (which contains it). Every step flips the checkerboard colour,
+    so a path of L cells uses ceil(L/2) cells of the start's colour and
+    floor(L/2) of the other: L <= min(2 * same, 2 * other + 1).
+    """
+    even = checkerboard(board.cols, board.rows)
+    same = popcount(region & even) if start & even else popcount(region & ~even)
+    other = popcount(region) - same
+    return min(2 * same, 2 * other + 1)
+
+def fill_move(board, my_pos, depth=FILL_DEPTH, node_budget=FILL_NODES, deadline=None):
+    """
+    Move that fills the most of my region, for when is_separated() holds.
+    Children are tried with the fewest onward exits first (Warnsdorff's
+    rule: hug walls, leave open space for later). Past `depth` plies or
+    `node_budget` expanded nodes the parity bound stands in for the rest.
+    `deadline` (a time.perf_counter() value) ends the search early: the
+    parity bound stands in from then on, and once one move has been
+    scored the best so far is returned.
+    """
+    rows = board.rows
+    not_top = board.not_top
+    not_bottom = board.not_bottom
+    full = board.full
+
+    def exits(head, free):
+        return [b for b in ((head >> 1) & not_bottom, (head << 1) & not_top,
+                            head >> rows, (head << rows) & full) if b & free]
+
+    def estimate(head, free):
+        # Best parity bound over the regions the head can step into; exits
+        # into the same region share one flood.
+        best = 0
+        seen = 0
+        for b in exits(head, free):
+            if b & seen:
+                continue
+            region = flood(board, b, free)
+            seen |= region
+            best = max(best, parity_bound(board, b, region))
+        return best
+
+    def out_of_time():
+        return deadline is not None and time.perf_counter() > deadline
+
+    memo = {}
+    nodes = [0]
+
+    def longest(head, free, depth):
+        """Cells that can still be filled after standing on `head`."""
+        key = (head, free, depth)
+        if key in memo:
+            return memo[key]
+        limit = estimate(head, free)
+        if depth == 0 or limit == 0 or nodes[0] >= node_budget or out_of_time():
+            return limit
+        nodes[0] += 1
+
+        children = exits(head, free)
+        children.sort(key=lambda b: len(exits(b, free ^ b)))
+        best = 0
+        for b in children:
+            value = 1 + longest(b, free ^ b, depth - 1)
+            if value > best:
+                best = value
+                if best >= limit:
+                    break
+        memo[key] = best
+        return best
+
+    head = board.bit(my_pos[0], my_pos[1])
+    free = board.free
+    shifted = {"UP": (head >> 1) & not_bottom, "DOWN": (head << 1) & not_top,
+               "LEFT": head >> rows, "RIGHT": (head << rows) & full}
+    candidates = [move for move in MOVES if shifted[move] & free]
+    if not candidates:
+        return "UP"
+
+    candidates.sort(key=lambda move: len(exits(shifted[move], free ^ shifted[move])))
+    limit = estimate(head, free)
+    best_move = candidates[0]
+    best = -1
+    for move in candidates:
+        if best >= 0 and out_of_time():
+            break
+        b = shifted[move]
+        value = 1 + longest(b, free ^ b, depth - 1)
+        if value > best:
+            best = value
+            best_move = move
+            if best >= limit:
+                break
+    return best_move
@@ -0,0 +1,96 @@
+import numpy as np
+
+# --- PADDED FLAT BOARD ---
+# The arena grid as one byte per cell in a flat buffer, surrounded by a
+# one-cell wall border. Cells are stored column by column like the
+# (COLS, ROWS) grid, with stride = rows + 2:
+#
+#   index(x, y) = (x + 1) * stride + (y + 1)
+#
+# Every in-board cell has all four neighbours inside the buffer, and the
+# border cells are never free, so a neighbour test is a single lookup at
+# idx -/+ 1 (up/down) or idx -/+ stride (left/right), with no bounds checks.
+
+FREE = 0
+WALL = 255
+
+_offset_cache = {}
+
+def neighbor_offsets(rows):
+    """
+    Precomputed index offsets for a board with `rows` rows:
+    (NEIGHBORS, MOVES) where NEIGHBORS is (x+1, x-1, y+1, y-1) - the order
+    the BFS expands in - and MOVES maps "UP"/"DOWN"/"LEFT"/"RIGHT" to offsets.
+    """
+    if rows not in _offset_cache:
+        stride = rows + 2
+        _offset_cache[rows] = (
+            (stride, -stride, 1, -1),
+            {"UP": -1, "DOWN": 1, "LEFT": -stride, "RIGHT": stride},
+        )
+    return _offset_cache[rows]
+
+class FlatBoard:
+    """
+    uint8 board with a wall border. `cells` is the padded bytearray (fast
+    scalar access), `array` a zero-copy NumPy view of it, and `view` the
+    (cols, rows) interior, so board[x][y], len(board) and np.asarray(board)
+    behave like the plain arena grid.
+    """
+    def __init__(self, cols, rows, cells=None):
+        self.cols = cols
+        self.rows = rows
+        self.stride = rows + 2
+        self.neighbors, self.moves = neighbor_offsets(rows)
+        if cells is None:
+            cells = bytearray([WALL]) * ((cols + 2) * self.stride)
+            self.cells = cells
+            self._bind()
+            self.view[:, :] = FREE
+        else:
+            self.cells = cells
+            self._bind()
+
+    def _bind(self):
+        self.array = np.frombuffer(self.cells, dtype=np.uint8)
+        self.view = self.array.reshape(self.cols + 2, self.stride)[1:-1, 1:-1]
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Copies any arena grid (nested lists, ndarray, FlatBoard) into a FlatBoard."""
+        if isinstance(grid, FlatBoard):
+            return grid.copy()
+        board = cls(len(grid), len(grid[0]))
+        board.view[:, :] = np.asarray(grid)
+        return board
+
+    def copy(self):
+        return FlatBoard(self.cols, self.rows, bytearray(self.cells))
+
+    def index(self, x, y):
+        return (x + 1) * self.stride + y + 1
+
+    def xy(self, index):
+        x, y = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def is_free(self, x, y):
+        if x < 0 or x >= self.cols or y < 0 or y >= self.rows:
+            return False
+        return self.cells[(x + 1) * self.stride + y + 1] == FREE
+
+    def set(self, x, y, value):
+        self.cells[(x + 1) * self.stride + y + 1] = value
+
+    # --- ARENA-GRID COMPATIBILITY ---
+
+    def __len__(self):
+        return self.cols
+
+    def __getitem__(self, x):
+        return self.view[x]
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None:
+            return self.view.astype(dtype)
+        return self.view.copy() if copy else self.view
@@ -1,20 +1,34 @@
+import argparse
 import pygame
-import numpy as np
 import sys
 import time
 
 # --- IMPORTS ---
-import smart_tron_bot
+import maps
+from bot_driver import AsyncBot
+from bot_loader import load_player
+from instrumentation import Histogram, TimedPlayer
+from renderer import BoardRenderer, CachedFont, fit_cell
+from tron_engine import TronEngine, P1, P2
 
 # --- CONSTANTS ---
 GAME_WIDTH = 600
 SIDEBAR_WIDTH = 320
 WIDTH = GAME_WIDTH + SIDEBAR_WIDTH
 HEIGHT = 600
+# Default board (no map given): open, 20-pixel cells
 GRID_SIZE = 20
 COLS = GAME_WIDTH // GRID_SIZE
 ROWS = HEIGHT // GRID_SIZE
 MAX_MATCHES = 5
+SIDEBAR_RECT = pygame.Rect(GAME_WIDTH - 1, 0, SIDEBAR_WIDTH + 1, HEIGHT)
+DIVIDER_RECT = pygame.Rect(GAME_WIDTH - 1, 0, 3, HEIGHT)
+# Arena-standard bot module the human plays against
+AI_BOT = "smart_tron_bot"
+# Run the AI in its own process instead of a thread (no GIL sharing with rendering)
+AI_IN_PROCESS = False
+# How often the AI's p99 move time in the sidebar is refreshed
+STATS_REFRESH_MS = 500
 
 # COLORS
 BLACK = (10, 10, 15)
@@ -29,7 +43,7 @@ YELLOW = (255, 255, 0)
 PURPLE = (180, 50, 255)
 
 class TronGame:
-    def __init__(self):
+    def __init__(self, map_name=None):
         pygame.init()
         pygame.mixer.init() 
         
@@ -61,17 +75,17 @@ class TronGame:
         
         # Fonts
         try:
-            self.title_font = pygame.font.SysFont("impact", 40)
-            self.header_font = pygame.font.SysFont("monospace", 28, bold=True)
-            self.text_font = pygame.font.SysFont("monospace", 18)
-            self.score_font = pygame.font.SysFont("monospace", 50, bold=True)
-            self.status_font = pygame.font.SysFont("monospace", 22, bold=True)
+            self.title_font = CachedFont(pygame.font.SysFont("impact", 40))
+            self.header_font = CachedFont(pygame.font.SysFont("monospace", 28, bold=True))
+            self.text_font = CachedFont(pygame.font.SysFont("monospace", 18))
+            self.score_font = CachedFont(pygame.font.SysFont("monospace", 50, bold=True))
+            self.status_font = CachedFont(pygame.font.SysFont("monospace", 22, bold=True))
         except:
-             self.title_font = pygame.font.SysFont("Arial", 40, bold=True)
-             self.header_font = pygame.font.SysFont("Courier", 28, bold=True)
-             self.text_font = pygame.font.SysFont("Courier", 18)
-             self.score_font = pygame.font.SysFont("Courier", 50, bold=True)
-             self.status_font = pygame.font.SysFont("Courier", 22, bold=True)
+             self.title_font = CachedFont(pygame.font.SysFont("Arial", 40, bold=True))
+             self.header_font = CachedFont(pygame.font.SysFont("Courier", 28, bold=True))
+             self.text_font = CachedFont(pygame.font.SysFont("Courier", 18))
+             self.score_font = CachedFont(pygame.font.SysFont("Courier", 50, bold=True))
+             self.status_font = CachedFont(pygame.font.SysFont("Courier", 22, bold=True))
         
         # Game State
         self.match_count = 1
@@ -79,27 +93,50 @@ class TronGame:
         self.p2_score = 0
         self.tournament_over = False
         
+        # Board: a map file or the default open board (see maps.py), with
+        # cells scaled to fit the play area
+        self.map = maps.load_map(map_name) if map_name else maps.Map(COLS, ROWS)
+        cell = fit_cell(self.map.cols, self.map.rows, GAME_WIDTH, HEIGHT)
+
+        # Retained-mode drawing (see renderer.py)
+        self.renderer = BoardRenderer(self.map.cols, self.map.rows, cell,
+                                      {P1: (NEON_GREEN, (150, 255, 150)), P2: (NEON_RED, (255, 150, 150))},
+                                      {P1: NEON_GREEN, P2: NEON_RED},
+                                      background=BLACK, grid_color=GRID_COLOR,
+                                      area=pygame.Rect(0, 0, GAME_WIDTH, HEIGHT))
+        self.sidebar_key = None
+
         # Initialize First Round
+        self.engine = TronEngine.from_map(self.map)
+        # The AI thinks in the background between steps. Its move times are
+        # recorded on the worker (a process worker keeps them to itself).
+        self.ai_latency = Histogram()
+        self.ai_p99 = 0.0
+        self.ai_p99_time = 0
+        self.ai = AsyncBot(TimedPlayer(load_player(AI_BOT), self.ai_latency),
+                           use_process=AI_IN_PROCESS)
         self.reset_round()
 
     def reset_round(self):
-        self.grid = np.zeros((COLS, ROWS))
-        
-        # Starting positions
-        self.p1_pos = [5, ROWS // 2]
-        self.p2_pos = [COLS - 6, ROWS // 2]
+        # Starting positions and trails live in the engine
+        self.engine.reset()
+        # A whole new board: redraw it all once
+        self.renderer.invalidate()
         
         # Initial Directions
         self.p1_dir = "RIGHT" 
         self.p1_next_dir = "RIGHT" 
         
-        # Mark start positions
-        self.grid[self.p1_pos[0]][self.p1_pos[1]] = 1
-        self.grid[self.p2_pos[0]][self.p2_pos[1]] = 2
-        
         self.round_over = False
         self.winner = None
         self.last_move_time = pygame.time.get_ticks()
+        engine = self.engine
+        self.ai.new_round(engine.grid, engine.p2_pos, P2, engine.p1_pos)
+        self.start_ai()
+
+    def start_ai(self):
+        engine = self.engine
+        self.ai.think(engine.grid, engine.p2_pos, engine.p1_pos)
 
     def toggle_fullscreen(self):
         self.fullscreen = not self.fullscreen
@@ -107,6 +144,9 @@ class TronGame:
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
         else:
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # New display surface: everything has to be drawn again
+        self.renderer.invalidate()
+        self.sidebar_key = None
 
     def play_sound(self, sound_type):
         if self.sounds_loaded:
@@ -115,6 +155,9 @@ class TronGame:
             elif sound_type == "crash":
                 self.snd_crash.play()
 
+    def sidebar_state(self):
+        return (self.p1_score, self.p2_score, self.round_over, self.winner, self.ai_p99)
+
     def draw_sidebar(self):
         pygame.draw.rect(self.screen, SIDEBAR_BG, (GAME_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT))
         pygame.draw.line(self.screen, DARK_GRAY, (GAME_WIDTH, 0), (GAME_WIDTH, HEIGHT), 3)
@@ -146,6 +189,8 @@ class TronGame:
         self.screen.blit(p2_label, (GAME_WIDTH + 40, 300))
         p2_sub = self.text_font.render("Voronoi Bot", True, (255, 150, 150))
         self.screen.blit(p2_sub, (GAME_WIDTH + 40, 335))
+        latency = self.text_font.render(f"p99 move: {self.ai_p99:.1f} ms", True, (100, 100, 100))
+        self.screen.blit(latency, latency.get_rect(center=(center_x, 385)))
 
         # Scoreboard
         score_bg_rect = pygame.Rect(GAME_WIDTH + 20, 400, 280, 100)
@@ -183,37 +228,23 @@ class TronGame:
             self.screen.blit(res_text, res_rect)
 
     def draw(self):
-        self.screen.fill(BLACK)
-        
-        for x in range(0, GAME_WIDTH, GRID_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (x, 0), (x, HEIGHT), 1)
-        for y in range(0, HEIGHT, GRID_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (0, y), (GAME_WIDTH, y), 1)
-
-        for x in range(COLS):
-            for y in range(ROWS):
-                if self.grid[x][y] == 1:
-                    pygame.draw.rect(self.screen, NEON_GREEN, (x*GRID_SIZE, y*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(self.screen, (150, 255, 150), (x*GRID_SIZE+5, y*GRID_SIZE+5, GRID_SIZE-10, GRID_SIZE-10))
-                elif self.grid[x][y] == 2:
-                    pygame.draw.rect(self.screen, NEON_RED, (x*GRID_SIZE, y*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(self.screen, (255, 150, 150), (x*GRID_SIZE+5, y*GRID_SIZE+5, GRID_SIZE-10, GRID_SIZE-10))
+        # Only cells that changed since the last frame are redrawn
+        engine = self.engine
+        dirty = self.renderer.draw(self.screen, engine.grid,
+                                   [(engine.p1_pos, P1), (engine.p2_pos, P2)])
+        if any(rect.right >= GAME_WIDTH for rect in dirty):
+            # The last column overlaps the sidebar divider
+            pygame.draw.line(self.screen, DARK_GRAY, (GAME_WIDTH, 0), (GAME_WIDTH, HEIGHT), 3)
+            dirty.append(DIVIDER_RECT)
 
-        pygame.draw.rect(self.screen, WHITE, (self.p1_pos[0]*GRID_SIZE, self.p1_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(self.screen, NEON_GREEN, (self.p1_pos[0]*GRID_SIZE, self.p1_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE), 2)
-        
-        pygame.draw.rect(self.screen, WHITE, (self.p2_pos[0]*GRID_SIZE, self.p2_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(self.screen, NEON_RED, (self.p2_pos[0]*GRID_SIZE, self.p2_pos[1]*GRID_SIZE, GRID_SIZE, GRID_SIZE), 2)
+        # The sidebar is redrawn only when something it shows changed
+        key = self.sidebar_state()
+        if key != self.sidebar_key:
+            self.sidebar_key = key
+            self.draw_sidebar()
+            dirty.append(SIDEBAR_RECT)
 
-        self.draw_sidebar()
-        pygame.display.update()
-
-    def is_safe(self, x, y):
-        if x < 0 or x >= COLS or y < 0 or y >= ROWS:
-            return False
-        if self.grid[x][y] != 0:
-            return False
-        return True
+        pygame.display.update(dirty)
 
     def run(self):
         running = True
@@ -259,43 +290,26 @@ class TronGame:
                 if not self.tournament_over and not self.round_over:
                     self.p1_dir = self.p1_next_dir
                     move1 = self.p1_dir
-                    move2 = smart_tron_bot.get_move(self.grid.copy(), self.p2_pos, 2, self.p1_pos)
-
-                    new_p1 = list(self.p1_pos)
-                    if move1 == "UP": new_p1[1] -= 1
-                    elif move1 == "DOWN": new_p1[1] += 1
-                    elif move1 == "LEFT": new_p1[0] -= 1
-                    elif move1 == "RIGHT": new_p1[0] += 1
+                    engine = self.engine
+                    # Whatever the AI has by now, or a safe fallback move
+                    move2 = self.ai.result()
 
-                    new_p2 = list(self.p2_pos)
-                    if move2 == "UP": new_p2[1] -= 1
-                    elif move2 == "DOWN": new_p2[1] += 1
-                    elif move2 == "LEFT": new_p2[0] -= 1
-                    elif move2 == "RIGHT": new_p2[0] += 1
-
-                    p1_dead = not self.is_safe(new_p1[0], new_p1[1])
-                    p2_dead = not self.is_safe(new_p2[0], new_p2[1])
-                    
-                    if new_p1 == new_p2:
-                        p1_dead = True
-                        p2_dead = True
-
-                    if p1_dead or p2_dead:
+                    result = engine.step(move1, move2)
+                    # The new heads are the only cells the step set
+                    self.renderer.mark((engine.p1_pos, engine.p2_pos))
+                    if result is not None:
                         self.play_sound("crash") 
-                        if p1_dead and p2_dead:
-                            self.winner = "DRAW"
-                        elif p1_dead:
-                            self.winner = "RED"
-                            self.p2_score += 1
-                        elif p2_dead:
+                        if result == P1:
                             self.winner = "GREEN"
                             self.p1_score += 1
+                        elif result == P2:
+                            self.winner = "RED"
+                            self.p2_score += 1
+                        else:
+                            self.winner = "DRAW"
                         self.round_over = True
                     else:
-                        self.p1_pos = new_p1
-                        self.grid[new_p1[0]][new_p1[1]] = 1
-                        self.p2_pos = new_p2
-                        self.grid[new_p2[0]][new_p2[1]] = 2
+                        self.start_ai()
                 
                 elif self.round_over and not self.tournament_over:
                     self.draw() 
@@ -308,12 +322,21 @@ class TronGame:
                         self.tournament_over = True
             
             # 3. RENDER
+            if current_time - self.ai_p99_time >= STATS_REFRESH_MS:
+                self.ai_p99_time = current_time
+                self.ai_p99 = round(1000 * self.ai_latency.percentile(99), 1)
             self.draw()
             self.clock.tick(60)
 
+        self.ai.close()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = TronGame()
+    parser = argparse.ArgumentParser(description="TRON: human vs AI.")
+    parser.add_argument("--map", default=None,
+                        help="Map name (%s) or .tmap file" % ", ".join(maps.available_maps()))
+    args = parser.parse_args()
+
+    game = TronGame(args.map)
     game.run()
\ No newline at end of file
@@ -0,0 +1,139 @@
+import cProfile
+import json
+import math
+import pstats
+import sys
+import time
+
+# --- INSTRUMENTATION ---
+# Cheap always-on timing for the front-ends: bot moves and frame phases
+# go into fixed-size log-scale histograms (a few hundred counters each,
+# however long the tournament), from which p50/p99/max are read live.
+# cProfile is opt-in, since it slows every Python call down.
+
+class Histogram:
+    """
+    Latency histogram with log-spaced buckets from MIN_SECONDS up, 40 per
+    decade, so a percentile is exact to within about 6%. `max` is exact.
+    """
+    MIN_SECONDS = 1e-7
+    PER_DECADE = 40
+    BUCKETS = 9 * PER_DECADE  # up to 100 s
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds > self.MIN_SECONDS:
+            bucket = min(int(math.log10(seconds / self.MIN_SECONDS) * self.PER_DECADE),
+                         self.BUCKETS - 1)
+        else:
+            bucket = 0
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile (0-100), in seconds."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                edge = self.MIN_SECONDS * 10 ** ((bucket + 1) / self.PER_DECADE)
+                return min(edge, self.max)
+        return self.max
+
+    def summary(self):
+        """count, mean, p50, p99 and max, in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+            "p50_ms": 1000 * self.percentile(50),
+            "p99_ms": 1000 * self.percentile(99),
+            "max_ms": 1000 * self.max,
+        }
+
+class TimedPlayer:
+    """Delta-API player (see tron_engine) that records each step() in `histogram`."""
+    def __init__(self, player, histogram):
+        self.player = player
+        self.histogram = histogram
+
+    def start(self, grid, my_pos, my_id, opp_pos):
+        self.player.start(grid, my_pos, my_id, opp_pos)
+
+    def update(self, my_pos, opp_pos):
+        self.player.update(my_pos, opp_pos)
+
+    def step(self, my_pos, opp_pos):
+        start = time.perf_counter()
+        move = self.player.step(my_pos, opp_pos)
+        self.histogram.record(time.perf_counter() - start)
+        return move
+
+    def __getattr__(self, name):
+        # timeouts, close() etc. of the wrapped player. Not while unpickling
+        # (no self.player yet) and not for special methods, which pickle
+        # and copy look up on the wrapper itself.
+        if name == "player" or (name.startswith("__") and name.endswith("__")):
+            raise AttributeError(name)
+        return getattr(self.player, name)
+
+class Instruments:
+    """
+    Named histograms for one front-end session, plus an optional cProfile
+    run. histogram(name) creates on first use; summary() collects them
+    with the `stats` dicts of in-process bot modules (e.g. the BFS node
+    count of smart_tron_bot) for the JSON export.
+    """
+    def __init__(self, profile=False):
+        self.histograms = {}
+        self.profiler = cProfile.Profile() if profile else None
+
+    def histogram(self, name):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def start_profile(self):
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop_profile(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def summary(self, bot_modules=()):
+        summary = {name: hist.summary() for name, hist in self.histograms.items()}
+        # Bots running in their own process keep their counters there
+        bots = {}
+        for name in bot_modules:
+            stats = getattr(sys.modules.get(name), "stats", None)
+            if isinstance(stats, dict):
+                bots[name] = dict(stats)
+        if bots:
+            summary["bot_stats"] = bots
+        return summary
+
+    def export(self, path, bot_modules=(), extra=None):
+        """Writes summary() (plus `extra`) as JSON."""
+        summary = self.summary(bot_modules)
+        if extra:
+            summary.update(extra)
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    def dump_profile(self, path):
+        """Saves the cProfile data for pstats/snakeviz and prints the top entries."""
+        if self.profiler is None:
+            return
+        self.profiler.dump_stats(path)
+        pstats.Stats(path).sort_stats("cumulative").print_stats(15)
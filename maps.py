@@ -0,0 +1,160 @@
+import math
+import os
+import sys
+
+import numpy as np
+
+# --- MAPS ---
+# A map is a board size, static wall cells and an ordered list of start
+# positions (player 1 first). Two-player rounds use the first two starts.
+# Map files (.tmap) are plain text, run-length encoded, one line per
+# board row (top to bottom):
+#
+#   # comment
+#   <cols> <rows>
+#   <runs>[*<repeat>]
+#
+# A run is an optional count and a cell character: "." free, "#" wall,
+# "A"-"Z" the start of player 1-26 (count 1). "*<repeat>" repeats the
+# whole row, so an empty 300x300 arena is the single line "300.*300".
+# A file without start letters gets the default starts.
+
+FREE_CHAR = "."
+WALL_CHAR = "#"
+
+def _map_dir():
+    # Next to this module, or unpacked next to a frozen build
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, "maps")
+
+MAP_DIR = _map_dir()
+
+def default_starts(cols, rows, players=2):
+    """
+    The classic two starts: 5 cells in from the left and right edges,
+    mid-height. More players are spaced evenly around an ellipse 5 cells
+    in from the edges, player 1 on the left, going clockwise.
+    """
+    if players == 2:
+        return [(5, rows // 2), (cols - 6, rows // 2)]
+    cx = (cols - 1) / 2
+    cy = (rows - 1) / 2
+    starts = []
+    for player in range(players):
+        angle = math.pi + 2 * math.pi * player / players
+        starts.append((int(round(cx + (cx - 5) * math.cos(angle))),
+                       int(round(cy + (cy - 5) * math.sin(angle)))))
+    return starts
+
+class Map:
+    """
+    Board size, walls ((cols, rows) bool array, or None for an open board)
+    and start positions [(x, y), ...].
+    """
+    def __init__(self, cols, rows, walls=None, starts=None, name="open"):
+        self.cols = cols
+        self.rows = rows
+        self.walls = walls if walls is not None and walls.any() else None
+        self.starts = [tuple(pos) for pos in starts] if starts else default_starts(cols, rows)
+        self.name = name
+        if len(self.starts) < 2:
+            raise ValueError(f"map {name!r} needs at least two starts")
+        for x, y in self.starts:
+            if not (0 <= x < cols and 0 <= y < rows) or self.is_wall(x, y):
+                raise ValueError(f"map {name!r}: start {(x, y)} is not on a free cell")
+
+    def is_wall(self, x, y):
+        return self.walls is not None and bool(self.walls[x, y])
+
+    def wall_cells(self):
+        """Wall cells as flat grid indices (x * rows + y)."""
+        if self.walls is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self.walls)
+
+def parse_map(text, name="map"):
+    """Builds a Map from .tmap text."""
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith("#")]
+    if not lines:
+        raise ValueError(f"map {name!r} is empty")
+    cols, rows = (int(v) for v in lines[0].split())
+
+    walls = np.zeros((cols, rows), dtype=bool)
+    found = {}
+    y = 0
+    for line in lines[1:]:
+        runs, _, repeat = line.partition("*")
+        repeat = int(repeat) if repeat else 1
+        row = []
+        count = ""
+        for char in runs:
+            if char.isdigit():
+                count += char
+                continue
+            row.extend(char * int(count or 1))
+            count = ""
+        if count or len(row) != cols:
+            raise ValueError(f"map {name!r}: row {y} is {len(row)} cells wide, not {cols}")
+
+        for _ in range(repeat):
+            if y >= rows:
+                raise ValueError(f"map {name!r} has more than {rows} rows")
+            for x, char in enumerate(row):
+                if char == WALL_CHAR:
+                    walls[x, y] = True
+                elif "A" <= char <= "Z":
+                    if char in found:
+                        raise ValueError(f"map {name!r}: start {char} appears twice")
+                    found[char] = (x, y)
+                elif char != FREE_CHAR:
+                    raise ValueError(f"map {name!r}: unknown cell {char!r}")
+            y += 1
+    if y != rows:
+        raise ValueError(f"map {name!r} has {y} rows, not {rows}")
+
+    starts = [found[char] for char in sorted(found)]
+    if starts and sorted(found) != [chr(ord("A") + i) for i in range(len(found))]:
+        raise ValueError(f"map {name!r}: starts must be A, B, C... without gaps")
+    return Map(cols, rows, walls, starts, name)
+
+def format_map(game_map):
+    """The .tmap text of a Map (run-length encoded, repeated rows folded)."""
+    chars = np.full((game_map.rows, game_map.cols), FREE_CHAR)
+    if game_map.walls is not None:
+        chars[game_map.walls.T] = WALL_CHAR
+    for player, (x, y) in enumerate(game_map.starts):
+        chars[y, x] = chr(ord("A") + player)
+
+    lines = [f"# {game_map.name}", f"{game_map.cols} {game_map.rows}"]
+    previous = None
+    for row in ("".join(row) for row in chars):
+        if row == previous:
+            base, _, repeat = lines[-1].partition("*")
+            lines[-1] = f"{base}*{int(repeat or 1) + 1}"
+            continue
+        previous = row
+        runs = []
+        x = 0
+        while x < len(row):
+            end = x
+            while end < len(row) and row[end] == row[x]:
+                end += 1
+            runs.append((str(end - x) if end - x > 1 else "") + row[x])
+            x = end
+        lines.append("".join(runs))
+    return "\n".join(lines) + "\n"
+
+def load_map(name):
+    """A map by file path or by name in MAP_DIR ("pillars" -> maps/pillars.tmap)."""
+    path = name
+    if not os.path.exists(path):
+        path = os.path.join(MAP_DIR, name if name.endswith(".tmap") else name + ".tmap")
+    with open(path) as f:
+        text = f.read()
+    return parse_map(text, os.path.splitext(os.path.basename(path))[0])
+
+def available_maps():
+    if not os.path.isdir(MAP_DIR):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(MAP_DIR) if f.endswith(".tmap"))
@@ -0,0 +1,139 @@
+import numpy as np
+import pygame
+
+# --- RETAINED-MODE RENDERING ---
+# The play field is drawn once and then only patched: the front-end marks
+# the cells each engine step sets (the new heads), and each frame blits
+# those plus the old and new heads and reports the rects for
+# pygame.display.update(rects). Frame cost depends on what moved, not on
+# the board size or how long the trails are.
+
+class CachedFont:
+    """A pygame font whose render() results are kept until the text changes."""
+    def __init__(self, font):
+        self.font = font
+        self.cache = {}
+
+    def render(self, text, antialias, color, background=None):
+        key = (text, antialias, color, background)
+        surf = self.cache.get(key)
+        if surf is None:
+            if len(self.cache) > 256:
+                self.cache.clear()
+            surf = self.font.render(text, antialias, color, background)
+            self.cache[key] = surf
+        return surf
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+def fit_cell(cols, rows, width, height):
+    """Largest whole-pixel cell size that fits a cols x rows board in width x height."""
+    return max(1, min(width // cols, height // rows))
+
+class BoardRenderer:
+    """
+    Draws a cols x rows board at `cell` pixels per cell, centred in `area`
+    (a screen rect; default: the board at the top-left). `styles` maps a
+    cell value to (trail colour, inner colour) and `heads` a player id to
+    its head border colour; other non-zero values are drawn as walls.
+    Small cells drop the details that no longer fit (grid lines, inner
+    squares, head borders).
+    """
+    def __init__(self, cols, rows, cell, styles, head_colors,
+                 background=(10, 10, 15), grid_color=(30, 30, 40),
+                 wall_color=(40, 40, 50), head_fill=(240, 240, 255), area=None):
+        self.cols = cols
+        self.rows = rows
+        self.cell = cell
+        self.area = area if area is not None else pygame.Rect(0, 0, cols * cell, rows * cell)
+        self.rect = pygame.Rect(0, 0, cols * cell, rows * cell)
+        self.rect.center = self.area.center
+        self.background_color = background
+
+        # Background with the grid lines, drawn once
+        self.background = pygame.Surface(self.rect.size)
+        self.background.fill(background)
+        if cell >= 4:
+            for x in range(0, self.rect.width, cell):
+                pygame.draw.line(self.background, grid_color, (x, 0), (x, self.rect.height), 1)
+            for y in range(0, self.rect.height, cell):
+                pygame.draw.line(self.background, grid_color, (0, y), (self.rect.width, y), 1)
+
+        # One pre-drawn tile per trail colour and per head
+        inset = cell // 4
+        self.tiles = {}
+        for value, (color, inner) in styles.items():
+            tile = pygame.Surface((cell, cell))
+            tile.fill(color)
+            if cell >= 8:
+                pygame.draw.rect(tile, inner, (inset, inset, cell - 2 * inset, cell - 2 * inset))
+            self.tiles[value] = tile
+        self.wall = pygame.Surface((cell, cell))
+        self.wall.fill(wall_color)
+        self.head_tiles = {}
+        for player, color in head_colors.items():
+            tile = pygame.Surface((cell, cell))
+            tile.fill(head_fill)
+            if cell >= 4:
+                pygame.draw.rect(tile, color, (0, 0, cell, cell), max(1, cell // 10))
+            self.head_tiles[player] = tile
+
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget what is on screen (new display surface, new round...): the next draw is a full one."""
+        self.valid = False
+        self.heads = []
+        self.changed = []
+
+    def mark(self, positions):
+        """Cells set by an engine step, (x, y) each; drawn at the next draw()."""
+        self.changed.extend(positions)
+
+    def _cell_rect(self, x, y):
+        return pygame.Rect(self.rect.x + x * self.cell, self.rect.y + y * self.cell,
+                           self.cell, self.cell)
+
+    def _draw_cell(self, screen, x, y, value):
+        rect = self._cell_rect(x, y)
+        if value == 0:
+            screen.blit(self.background, rect, rect.move(-self.rect.x, -self.rect.y))
+        else:
+            screen.blit(self.tiles.get(value, self.wall), rect)
+        return rect
+
+    def draw(self, screen, grid, heads):
+        """
+        Brings the field on `screen` up to date with `grid` and `heads`
+        (a list of ((x, y), player id)). Only the cells passed to mark()
+        since the last draw are looked at, unless invalidate() asked for a
+        full redraw. Returns the rects that changed.
+        """
+        cells = np.asarray(grid)
+        dirty = []
+        if not self.valid:
+            if self.area != self.rect:
+                screen.fill(self.background_color, self.area)
+            screen.blit(self.background, self.rect)
+            for x, y in np.argwhere(cells != 0):
+                self._draw_cell(screen, x, y, cells[x, y])
+            self.valid = True
+            self.heads = []
+            dirty.append(self.area)
+        else:
+            for x, y in self.changed:
+                dirty.append(self._draw_cell(screen, x, y, cells[x, y]))
+        self.changed = []
+
+        # Old heads go back to plain trail, new ones get the head tile
+        new_heads = [(int(x), int(y)) for (x, y), _ in heads]
+        for x, y in self.heads:
+            if (x, y) not in new_heads:
+                dirty.append(self._draw_cell(screen, x, y, cells[x, y]))
+        for (x, y), player in heads:
+            rect = self._cell_rect(x, y)
+            screen.blit(self.head_tiles[player], rect)
+            dirty.append(rect)
+        self.heads = new_heads
+        return dirty
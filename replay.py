@@ -0,0 +1,296 @@
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from tron_engine import TronEngine, DRAW, P1, P2
+
+_COUNT = struct.Struct("<I")
+
+# --- BINARY REPLAYS ---
+# A round is fully determined by its start positions and both players'
+# moves, so that is all a replay keeps: one nibble per tick, the P1 move
+# in the low 2 bits and the P2 move in the high 2 bits (index into MOVES).
+# A whole tournament goes into one file:
+#
+#   header   b"TRNR" version:u8 cols:u16 rows:u16
+#            len:u8 name1:utf8[len] len:u8 name2:utf8[len]
+#            walls:u32 wall_cells:u32[walls]      (x * rows + y; version 2)
+#   round    b"R" seed:u64 ticks:u32 winner:u8 forfeits:u8
+#            p1x:u16 p1y:u16 p2x:u16 p2y:u16 moves:u8[(ticks + 1) // 2]
+#   ...
+#   index    offsets:u64[count] count:u32 index_offset:u64 b"TRNX"
+#
+# Little-endian throughout. A move that is not one of MOVES (a bot that
+# timed out or crashed) can only happen on the last tick, since it ends
+# the round; it is stored as 0 with that player's bit set in `forfeits`.
+# The index is written on close(); a file whose recorder never closed is
+# still readable, the reader then finds the rounds by walking them.
+# Version 1 files (no wall list) are read as open boards.
+
+MAGIC = b"TRNR"
+INDEX_MAGIC = b"TRNX"
+VERSION = 2
+MOVES = ("UP", "DOWN", "LEFT", "RIGHT")
+
+_HEADER = struct.Struct("<4sBHH")
+_ROUND = struct.Struct("<cQIBBHHHH")
+_TRAILER = struct.Struct("<IQ4s")
+# The round header as a NumPy record, for reading many rounds at once
+ROUND_DTYPE = np.dtype([("tag", "S1"), ("seed", "<u8"), ("ticks", "<u4"), ("winner", "u1"),
+                        ("forfeits", "u1"), ("p1x", "<u2"), ("p1y", "<u2"),
+                        ("p2x", "<u2"), ("p2y", "<u2")])
+
+_CODES = {move: code for code, move in enumerate(MOVES)}
+_SEED_MASK = (1 << 64) - 1
+
+def pack_moves(moves):
+    """(bytes, forfeits) for a list of (move1, move2) ticks."""
+    codes = np.zeros(len(moves) + len(moves) % 2, dtype=np.uint8)
+    forfeits = 0
+    for tick, (move1, move2) in enumerate(moves):
+        code1 = _CODES.get(move1)
+        code2 = _CODES.get(move2)
+        if code1 is None:
+            forfeits |= 1
+            code1 = 0
+        if code2 is None:
+            forfeits |= 2
+            code2 = 0
+        codes[tick] = code1 | code2 << 2
+    return (codes[0::2] | codes[1::2] << 4).tobytes(), forfeits
+
+def unpack_moves(data, ticks, forfeits=0):
+    """The (move1, move2) ticks packed by pack_moves()."""
+    packed = np.frombuffer(data, dtype=np.uint8)
+    codes = np.empty(len(packed) * 2, dtype=np.uint8)
+    codes[0::2] = packed & 0x0F
+    codes[1::2] = packed >> 4
+    moves = [(MOVES[code & 3], MOVES[code >> 2]) for code in codes[:ticks].tolist()]
+    if ticks and forfeits:
+        move1, move2 = moves[-1]
+        moves[-1] = (None if forfeits & 1 else move1, None if forfeits & 2 else move2)
+    return moves
+
+def pack_round(seed, starts, moves, winner):
+    """One round record: `starts` is (p1_pos, p2_pos), `moves` the (move1, move2) ticks."""
+    data, forfeits = pack_moves(moves)
+    (p1x, p1y), (p2x, p2y) = starts
+    return _ROUND.pack(b"R", seed & _SEED_MASK, len(moves), winner, forfeits,
+                       p1x, p1y, p2x, p2y) + data
+
+def _wall_mask(cols, rows, cells):
+    if len(cells) == 0:
+        return None
+    walls = np.zeros(cols * rows, dtype=bool)
+    walls[np.asarray(cells, dtype=np.int64)] = True
+    return walls.reshape(cols, rows)
+
+class ReplayRound:
+    """One recorded round; moves are only unpacked when asked for."""
+    def __init__(self, cols, rows, record, walls=None):
+        _, self.seed, self.ticks, self.winner, self.forfeits, p1x, p1y, p2x, p2y = \
+            _ROUND.unpack_from(record)
+        self.cols = cols
+        self.rows = rows
+        self.walls = walls
+        self.starts = ([p1x, p1y], [p2x, p2y])
+        self.data = record[_ROUND.size:]
+
+    def moves(self):
+        return unpack_moves(self.data, self.ticks, self.forfeits)
+
+    def play(self):
+        """Replays the round, yielding the engine after every tick."""
+        engine = TronEngine(self.cols, self.rows, self.walls)
+        engine.reset(*self.starts)
+        for move1, move2 in self.moves():
+            engine.step(move1, move2)
+            yield engine
+
+def _stored_names(names):
+    """Bot names as the header stores them: at most 255 UTF-8 bytes each."""
+    return tuple(name.encode("utf-8")[:255].decode("utf-8", "ignore") for name in names)
+
+class ReplayWriter:
+    """
+    Appends rounds to a tournament replay file. `walls` is the map's
+    (cols, rows) bool wall array, if any. An existing file with the same
+    board and bot names is extended; its index is rewritten on close().
+    """
+    def __init__(self, path, cols, rows, names, walls=None):
+        self.path = path
+        self.cols = cols
+        self.rows = rows
+        self.offsets = []
+        wall_cells = np.flatnonzero(walls) if walls is not None else np.zeros(0, dtype=np.int64)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            reader = ReplayReader(path)
+            try:
+                if reader.version != VERSION:
+                    raise ValueError(f"{path} is a version {reader.version} replay file; "
+                                     f"only version {VERSION} files can be appended to")
+                if (reader.cols, reader.rows) != (cols, rows):
+                    raise ValueError(f"{path} holds {reader.cols}x{reader.rows} rounds, not {cols}x{rows}")
+                old_cells = np.flatnonzero(reader.walls) if reader.walls is not None else wall_cells[:0]
+                if not np.array_equal(old_cells, wall_cells):
+                    raise ValueError(f"{path} was recorded on a different map")
+                # Names are per file, so rounds of other bots would be credited to these
+                if reader.names != _stored_names(names):
+                    raise ValueError(f"{path} holds {reader.names[0]} vs {reader.names[1]} rounds, "
+                                     f"not {names[0]} vs {names[1]}")
+            except ValueError:
+                reader.close()
+                raise
+            self.names = reader.names
+            self.offsets = reader.offsets.tolist()
+            end = reader.end
+            reader.close()
+            self.file = open(path, "r+b")
+            # Drop the old index; it is written again on close()
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.names = _stored_names(names)
+            self.file = open(path, "wb")
+            self.file.write(_HEADER.pack(MAGIC, VERSION, cols, rows))
+            for name in self.names:
+                encoded = name.encode("utf-8")
+                self.file.write(bytes([len(encoded)]) + encoded)
+            self.file.write(_COUNT.pack(len(wall_cells)))
+            self.file.write(wall_cells.astype("<u4").tobytes())
+
+    def write_record(self, record):
+        """Appends a record made by pack_round()."""
+        self.offsets.append(self.file.tell())
+        self.file.write(record)
+
+    def add_round(self, seed, starts, moves, winner):
+        self.write_record(pack_round(seed, starts, moves, winner))
+        self.file.flush()
+
+    def close(self):
+        if self.file is None:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.asarray(self.offsets, dtype="<u8").tobytes())
+        self.file.write(_TRAILER.pack(len(self.offsets), index_offset, INDEX_MAGIC))
+        self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ReplayReader:
+    """
+    Random access to a replay file without loading it: only the header and
+    the round index are read up front, reader[i] seeks to round i and
+    iterating streams the rounds in order.
+    """
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        magic, self.version, self.cols, self.rows = _HEADER.unpack(self.file.read(_HEADER.size))
+        if magic != MAGIC or not 1 <= self.version <= VERSION:
+            raise ValueError(f"{path} is not a TRON replay (version {VERSION} or older)")
+        self.names = tuple(self.file.read(self.file.read(1)[0]).decode("utf-8") for _ in range(2))
+        cells = []
+        if self.version >= 2:
+            count, = _COUNT.unpack(self.file.read(_COUNT.size))
+            cells = np.frombuffer(self.file.read(4 * count), dtype="<u4")
+        self.walls = _wall_mask(self.cols, self.rows, cells)
+        self.start = self.file.tell()
+        self._load_index()
+
+    def _load_index(self):
+        self.file.seek(0, os.SEEK_END)
+        size = self.file.tell()
+        if size - self.start >= _TRAILER.size:
+            self.file.seek(size - _TRAILER.size)
+            count, index_offset, magic = _TRAILER.unpack(self.file.read(_TRAILER.size))
+            if magic == INDEX_MAGIC and index_offset + 8 * count + _TRAILER.size == size:
+                self.file.seek(index_offset)
+                self.offsets = np.frombuffer(self.file.read(8 * count), dtype="<u8")
+                self.end = index_offset
+                return
+
+        # No index (the recorder did not close): walk the round headers
+        offsets = []
+        offset = self.start
+        while offset + _ROUND.size <= size:
+            self.file.seek(offset)
+            head = self.file.read(_ROUND.size)
+            if head[:1] != b"R":
+                break
+            ticks = _ROUND.unpack(head)[2]
+            if offset + _ROUND.size + (ticks + 1) // 2 > size:
+                break  # cut off mid-round
+            offsets.append(offset)
+            offset += _ROUND.size + (ticks + 1) // 2
+        self.offsets = np.asarray(offsets, dtype="<u8")
+        self.end = offset
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _read_round(self):
+        head = self.file.read(_ROUND.size)
+        ticks = _ROUND.unpack(head)[2]
+        return ReplayRound(self.cols, self.rows, head + self.file.read((ticks + 1) // 2), self.walls)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.offsets)
+        if not 0 <= index < len(self.offsets):
+            raise IndexError("replay round out of range")
+        self.file.seek(int(self.offsets[index]))
+        return self._read_round()
+
+    def __iter__(self):
+        self.file.seek(self.start)
+        for _ in range(len(self.offsets)):
+            yield self._read_round()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or re-play a TRON replay file.")
+    parser.add_argument("path")
+    parser.add_argument("--round", type=int, default=None, help="Re-play this round and check its result")
+    args = parser.parse_args()
+
+    results = {P1: "P1", P2: "P2", DRAW: "DRAW"}
+    with ReplayReader(args.path) as reader:
+        print(f"{args.path}: {len(reader)} rounds on {reader.cols}x{reader.rows}, "
+              f"{reader.names[0]} vs {reader.names[1]}")
+        if args.round is None:
+            wins = {P1: 0, P2: 0, DRAW: 0}
+            ticks = 0
+            for rnd in reader:
+                wins[rnd.winner] += 1
+                ticks += rnd.ticks
+            print(f"  P1 WINS: {wins[P1]}  P2 WINS: {wins[P2]}  DRAWS: {wins[DRAW]}")
+            print(f"  AVG ROUND: {ticks / len(reader) if len(reader) else 0:.1f} ticks")
+            return
+
+        rnd = reader[args.round]
+        engine = None
+        for engine in rnd.play():
+            pass
+        replayed = engine.winner if engine is not None else None
+        status = "ok" if replayed == rnd.winner else "MISMATCH"
+        print(f"  round {args.round}: seed {rnd.seed}, {rnd.ticks} ticks, "
+              f"winner {results.get(rnd.winner)} (replayed: {results.get(replayed)}, {status})")
+
+if __name__ == "__main__":
+    main()
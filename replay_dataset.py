@@ -0,0 +1,209 @@
+import argparse
+import os
+
+import numpy as np
+
+import replay
+from flatboard import WALL
+from tron_engine import DRAW, P1, P2
+
+# --- REPLAY DATASETS ---
+# Bulk, read-only access to any number of replay files (see replay.py) of
+# the same board size. Files are memory-mapped: only the round headers
+# are gathered up front (23 bytes a round), packed moves are sliced
+# straight out of the mapping, and everything else is whole-array NumPy,
+# so a scan over millions of rounds runs at disk speed rather than one
+# Python call per round.
+#
+# Move codes are indices into replay.MOVES; NO_MOVE marks ticks past the
+# end of a round and forfeited moves.
+
+NO_MOVE = 255
+
+# Cell offsets per move code; NO_MOVE stays put
+_DX = np.zeros(256, dtype=np.int64)
+_DY = np.zeros(256, dtype=np.int64)
+_DX[:4] = (0, 0, -1, 1)
+_DY[:4] = (-1, 1, 0, 0)
+
+class ReplayDataset:
+    """
+    All rounds of one or more replay files, numbered in file order.
+    Per-round header fields are plain arrays: seeds, ticks, winners,
+    forfeits and starts ((rounds, 2, 2): player, x/y).
+    """
+    def __init__(self, paths):
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        self.paths = list(paths)
+        self.maps = []
+        self.walls = []
+        self.cols = self.rows = None
+        headers = []
+        data_offsets = []
+        file_ids = []
+        for file_id, path in enumerate(self.paths):
+            # The reader only loads the header and the round index
+            with replay.ReplayReader(path) as reader:
+                size = (reader.cols, reader.rows)
+                offsets = reader.offsets.astype(np.int64)
+                self.walls.append(reader.walls)
+            if self.cols is None:
+                self.cols, self.rows = size
+            elif size != (self.cols, self.rows):
+                raise ValueError(f"{path} is {size[0]}x{size[1]}, not {self.cols}x{self.rows}")
+            mapped = np.memmap(path, dtype=np.uint8, mode="r")
+            self.maps.append(mapped)
+
+            header_bytes = mapped[offsets[:, None] + np.arange(replay.ROUND_DTYPE.itemsize)]
+            headers.append(header_bytes.view(replay.ROUND_DTYPE).reshape(-1))
+            data_offsets.append(offsets + replay.ROUND_DTYPE.itemsize)
+            file_ids.append(np.full(len(offsets), file_id, dtype=np.int32))
+
+        header = np.concatenate(headers) if headers else np.zeros(0, dtype=replay.ROUND_DTYPE)
+        self.seeds = header["seed"]
+        self.ticks = header["ticks"].astype(np.int64)
+        self.winners = header["winner"]
+        self.forfeits = header["forfeits"]
+        self.starts = np.stack([np.stack([header["p1x"], header["p1y"]], axis=-1),
+                                np.stack([header["p2x"], header["p2y"]], axis=-1)],
+                               axis=1).astype(np.int64)
+        self.data_offsets = np.concatenate(data_offsets) if data_offsets else np.zeros(0, np.int64)
+        self.file_ids = np.concatenate(file_ids) if file_ids else np.zeros(0, np.int32)
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def _indices(self, indices):
+        if indices is None:
+            return np.arange(len(self))
+        return np.atleast_1d(np.asarray(indices, dtype=np.int64))
+
+    def packed(self, index):
+        """Round `index`'s packed moves: a zero-copy view into the mapped file."""
+        start = self.data_offsets[index]
+        return self.maps[self.file_ids[index]][start:start + (self.ticks[index] + 1) // 2]
+
+    def codes(self, indices=None, max_ticks=None):
+        """
+        Move codes of the given rounds (default: all) as a
+        (rounds, max_ticks, 2) uint8 array; max_ticks defaults to the
+        longest of them, later ticks are NO_MOVE.
+        """
+        indices = self._indices(indices)
+        ticks = self.ticks[indices]
+        if max_ticks is None:
+            max_ticks = int(ticks.max()) if len(ticks) else 0
+        width = (max_ticks + 1) // 2
+        column = np.arange(width)
+        packed = np.zeros((len(indices), width), dtype=np.uint8)
+        for file_id, mapped in enumerate(self.maps):
+            members = np.nonzero(self.file_ids[indices] == file_id)[0]
+            if len(members) == 0:
+                continue
+            valid = column < (ticks[members, None] + 1) // 2
+            where = np.where(valid, self.data_offsets[indices[members], None] + column, 0)
+            packed[members] = np.where(valid, mapped[where], 0)
+
+        nibbles = np.empty((len(indices), 2 * width), dtype=np.uint8)
+        nibbles[:, 0::2] = packed & 0x0F
+        nibbles[:, 1::2] = packed >> 4
+        nibbles = nibbles[:, :max_ticks]
+        codes = np.stack([nibbles & 3, nibbles >> 2], axis=-1)
+        codes[np.arange(max_ticks) >= ticks[:, None]] = NO_MOVE
+
+        # A forfeit is a stand-in 0 on the round's last tick
+        forfeits = self.forfeits[indices]
+        for player in (0, 1):
+            lost = np.nonzero((forfeits & (1 << player) != 0) & (ticks <= max_ticks) & (ticks > 0))[0]
+            codes[lost, ticks[lost] - 1, player] = NO_MOVE
+        return codes
+
+    def boards_at(self, tick, indices=None):
+        """
+        Re-simulates the given rounds (default: all) to `tick` in one go.
+        Returns (boards, heads): boards (rounds, cols, rows) uint8 laid out
+        like the engine grid, walls included, and heads (rounds, 2, 2).
+        Rounds shorter than `tick` are shown as they ended; the crash
+        tick leaves no trail.
+        """
+        indices = self._indices(indices)
+        codes = self.codes(indices, max_ticks=tick)
+        # Every move but the crashing one lands on a free cell
+        steps = np.minimum(tick, np.maximum(self.ticks[indices] - 1, 0))
+        moved = np.arange(tick) < steps[:, None]
+        dx = np.where(moved[..., None], _DX[codes], 0)
+        dy = np.where(moved[..., None], _DY[codes], 0)
+        starts = self.starts[indices]
+        xs = starts[:, None, :, 0] + np.cumsum(dx, axis=1)
+        ys = starts[:, None, :, 1] + np.cumsum(dy, axis=1)
+
+        rounds = np.arange(len(indices))
+        boards = np.zeros((len(indices), self.cols, self.rows), dtype=np.uint8)
+        for file_id, walls in enumerate(self.walls):
+            if walls is not None:
+                members = self.file_ids[indices] == file_id
+                boards[members] = np.where(walls, WALL, 0)
+        trail_rounds, trail_ticks = np.nonzero(moved)
+        for player, value in ((0, P1), (1, P2)):
+            boards[rounds, starts[:, player, 0], starts[:, player, 1]] = value
+            boards[trail_rounds, xs[trail_rounds, trail_ticks, player],
+                   ys[trail_rounds, trail_ticks, player]] = value
+
+        heads = starts.copy()
+        if tick > 0:
+            last = np.maximum(steps - 1, 0)
+            has_moved = steps > 0
+            heads[has_moved, :, 0] = xs[rounds, last][has_moved]
+            heads[has_moved, :, 1] = ys[rounds, last][has_moved]
+        return boards, heads
+
+    # --- ANALYTICS ---
+
+    def opening_moves(self, tick=0):
+        """4x4 counts of (P1 move, P2 move) codes on `tick`, over rounds that reach it."""
+        indices = np.nonzero(self.ticks > tick)[0]
+        codes = np.zeros((0, 2), dtype=np.uint8)
+        if len(indices):
+            codes = self.codes(indices, max_ticks=tick + 1)[:, tick]
+        codes = codes[(codes != NO_MOVE).all(axis=1)].astype(np.int64)
+        return np.bincount(codes[:, 0] * 4 + codes[:, 1], minlength=16).reshape(4, 4)
+
+    def summary(self):
+        """Round count, length stats and per-seat results."""
+        rounds = len(self)
+        results = np.bincount(self.winners, minlength=3)
+        rate = (lambda count: count / rounds) if rounds else (lambda count: 0.0)
+        return {
+            "rounds": rounds,
+            "avg_ticks": float(self.ticks.mean()) if rounds else 0.0,
+            "max_ticks": int(self.ticks.max()) if rounds else 0,
+            "p1_win_rate": rate(int(results[P1])),
+            "p2_win_rate": rate(int(results[P2])),
+            "draw_rate": rate(int(results[DRAW])),
+            # Both cycles move at once, so the only "first mover" edge is the seat
+            "seat_advantage": rate(int(results[P1]) - int(results[P2])),
+            "forfeits": int(np.count_nonzero(self.forfeits)),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics over TRON replay files.")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    dataset = ReplayDataset(args.paths)
+    stats = dataset.summary()
+    print(f"{stats['rounds']} rounds on {dataset.cols}x{dataset.rows} from {len(args.paths)} file(s)")
+    print(f"  AVG ROUND:  {stats['avg_ticks']:.1f} ticks (max {stats['max_ticks']})")
+    print(f"  P1 WINS:    {stats['p1_win_rate']:.1%}   P2 WINS: {stats['p2_win_rate']:.1%}"
+          f"   DRAWS: {stats['draw_rate']:.1%}")
+    print(f"  SEAT EDGE:  {stats['seat_advantage']:+.1%} for P1   FORFEITS: {stats['forfeits']}")
+
+    print("  OPENING MOVES (P1 rows, P2 columns):")
+    table = dataset.opening_moves()
+    print("    " + " " * 6 + "".join(f"{move:>8}" for move in replay.MOVES))
+    for code, move in enumerate(replay.MOVES):
+        print(f"    {move:<6}" + "".join(f"{count:>8}" for count in table[code]))
+
+if __name__ == "__main__":
+    main()
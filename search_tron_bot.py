@@ -0,0 +1,285 @@
+import time
+
+import endgame
+from bitboard import Bitboard, popcount, voronoi
+from zobrist import EXACT, LOWER, UPPER, TranspositionTable, ZobristKeys
+
+# --- SEARCH BOT ---
+# Looks several moves ahead for both players instead of scoring one move
+# against a standing opponent. Each ply is a pair of simultaneous moves:
+# I pick a move (max), then the opponent answers (min) - pessimistic, as if
+# they could see my choice, which is the usual way to fit simultaneous
+# moves into alpha-beta. Leaves are scored by Voronoi territory.
+#
+# Iterative deepening under a wall-clock budget: depth 1, 2, 3, ... until
+# the deadline, keeping the best move of the deepest finished iteration.
+# Positions are Zobrist-hashed incrementally and looked up in a
+# transposition table that lives as long as the bot, so results found by
+# one iteration (or the previous tick) order and cut the next.
+
+# Per-move wall-clock budget in seconds; game.py steps every 80 ms
+TIME_BUDGET = 0.010
+MAX_DEPTH = 32
+# Memory cap of each bot's transposition table
+TT_BYTES = 16 * 1024 * 1024
+
+WIN = 100000
+
+MOVES = (("UP", 0, -1), ("DOWN", 0, 1), ("LEFT", -1, 0), ("RIGHT", 1, 0))
+
+class _Timeout(Exception):
+    pass
+
+def _moves(board, pos):
+    x, y = pos
+    return [(move, (x + dx, y + dy)) for move, dx, dy in MOVES
+            if board.is_free(x + dx, y + dy)]
+
+def _most_open(board, moves):
+    """Cheap fallback: the move with the most free cells around it."""
+    free = board.free
+    return max(moves, key=lambda m: popcount(board.neighbors(board.bit(*m[1])) & free))[0]
+
+class SearchBot:
+    """
+    Arena-standard bot with its own search settings.
+    After every get_move, `stats` holds the deepest finished depth, the
+    nodes searched, the time spent (seconds), nodes per second and the
+    transposition-table hits, copied to the module-level `stats` as well.
+    """
+    def __init__(self, budget=TIME_BUDGET, max_depth=MAX_DEPTH, tt_bytes=TT_BYTES):
+        self.budget = budget
+        self.max_depth = max_depth
+        self.table = TranspositionTable(tt_bytes)
+        self.stats = {"depth": 0, "nodes": 0, "elapsed": 0.0, "nps": 0, "tt_hits": 0}
+        # Trail hash of the last root, updated with only the new cells
+        self.root_occupied = None
+        self.root_size = None
+        self.root_hash = 0
+        self.board = None
+
+    # Delta API (see tron_engine): one Bitboard kept for the whole round
+
+    def start(self, grid, my_pos, my_id, opp_pos):
+        self.board = Bitboard.from_grid(grid)
+        self.my_id = my_id
+
+    def update(self, my_pos, opp_pos):
+        self.board.occupy(my_pos[0], my_pos[1])
+        self.board.occupy(opp_pos[0], opp_pos[1])
+
+    def step(self, my_pos, opp_pos):
+        self.update(my_pos, opp_pos)
+        return self.get_move(self.board, my_pos, self.my_id, opp_pos)
+
+    def get_move(self, grid, my_pos, my_id, opp_pos):
+        start = time.perf_counter()
+        self.deadline = start + self.budget
+        self.nodes = 0
+        self.table.new_search()
+        hits = self.table.hits
+
+        # The search makes and unmakes moves on this board in place
+        if isinstance(grid, Bitboard):
+            board = grid.copy()
+        else:
+            board = Bitboard.from_grid(grid)
+        my_pos = tuple(my_pos)
+        opp_pos = tuple(opp_pos)
+
+        moves = _moves(board, my_pos)
+        best_move = moves[0][0] if moves else "UP"
+        depth_done = 0
+
+        if len(moves) > 1:
+            if endgame.is_separated(board, my_pos, opp_pos, self.deadline):
+                # Nothing left to fight over; the fill solver does better
+                best_move = endgame.fill_move(board, my_pos, deadline=self.deadline)
+            else:
+                self.keys = ZobristKeys.for_size(board.cols, board.rows)
+                h = self._hash_trails(board) ^ self.keys.hash_heads(my_pos, opp_pos)
+                occupied = board.occupied
+                for depth in range(1, self.max_depth + 1):
+                    self.root_best = None
+                    try:
+                        best_move, score = self._root(board, h, my_pos, moves, opp_pos, depth)
+                    except _Timeout:
+                        # Moves made below the timeout were never unmade
+                        board.occupied = occupied
+                        if depth_done == 0:
+                            # Not even depth 1 finished (big board): the best
+                            # root move scored so far, else the most open one
+                            best_move = self.root_best or _most_open(board, moves)
+                        break
+                    depth_done = depth
+                    if abs(score) >= WIN:
+                        break  # forced win or loss: deeper search won't change it
+                    # Search the current best first next time
+                    moves.sort(key=lambda m: m[0] != best_move)
+
+        elapsed = time.perf_counter() - start
+        self.stats["depth"] = depth_done
+        self.stats["nodes"] = self.nodes
+        self.stats["elapsed"] = elapsed
+        self.stats["nps"] = int(self.nodes / elapsed) if elapsed > 0 else 0
+        self.stats["tt_hits"] = self.table.hits - hits
+        stats.update(self.stats)
+        return best_move
+
+    def _hash_trails(self, board):
+        previous = self.root_occupied
+        size = (board.cols, board.rows)
+        if previous is not None and size == self.root_size and not previous & ~board.occupied:
+            self.root_hash ^= self.keys.hash_cells(board.occupied ^ previous)
+        else:
+            self.root_hash = self.keys.hash_cells(board.occupied)
+        self.root_occupied = board.occupied
+        self.root_size = size
+        return self.root_hash
+
+    def _root(self, board, h, my_pos, moves, opp_pos, depth):
+        best_move = moves[0][0]
+        alpha = -WIN * 2
+        for move, my_next in moves:
+            score = self._reply(board, self._commit(h, my_pos, my_next), my_next, opp_pos,
+                                depth, alpha, WIN * 2)
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self.root_best = move
+        self.table.store(h, depth, alpha, EXACT, best_move)
+        return best_move, alpha
+
+    def _commit(self, h, my_pos, my_next):
+        """Hash after I pick `my_next`: my head moves, opponent to move."""
+        rows = self.keys.rows
+        mine = self.keys.mine
+        return (h ^ mine[my_pos[0] * rows + my_pos[1]]
+                ^ mine[my_next[0] * rows + my_next[1]] ^ self.keys.side)
+
+    def _max(self, board, h, my_pos, opp_pos, depth, alpha, beta):
+        """Value of the position for me, with me to pick a move."""
+        entry = self.table.probe(h)
+        first = None
+        if entry is not None:
+            if entry[1] >= depth:
+                value = entry[2]
+                if entry[3] == EXACT:
+                    return value
+                if entry[3] == LOWER and value >= beta:
+                    return value
+                if entry[3] == UPPER and value <= alpha:
+                    return value
+            first = entry[4]
+
+        moves = _moves(board, my_pos)
+        if not moves:
+            # Crashed; a draw if the opponent is stuck as well
+            return 0 if not _moves(board, opp_pos) else -WIN - depth
+        if first is not None:
+            # Best move from an earlier search of this position first
+            moves.sort(key=lambda m: m[0] != first)
+
+        original_alpha = alpha
+        best_move = moves[0][0]
+        for move, my_next in moves:
+            score = self._reply(board, self._commit(h, my_pos, my_next), my_next, opp_pos,
+                                depth, alpha, beta)
+            if score > alpha:
+                alpha = score
+                best_move = move
+                if alpha >= beta:
+                    break
+
+        if alpha >= beta:
+            flag = LOWER
+        elif alpha <= original_alpha:
+            flag = UPPER
+        else:
+            flag = EXACT
+        self.table.store(h, depth, alpha, flag, best_move)
+        return alpha
+
+    def _reply(self, board, h, my_next, opp_pos, depth, alpha, beta):
+        """Opponent's best answer once I have committed to `my_next`."""
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise _Timeout()
+
+        entry = self.table.probe(h)
+        if entry is not None and entry[1] >= depth:
+            value = entry[2]
+            if entry[3] == EXACT:
+                return value
+            if entry[3] == LOWER and value >= beta:
+                return value
+            if entry[3] == UPPER and value <= alpha:
+                return value
+
+        replies = _moves(board, opp_pos)
+        if not replies:
+            return WIN + depth
+
+        keys = self.keys
+        rows = keys.rows
+        occupied = keys.occupied
+        theirs = keys.theirs
+        my_index = my_next[0] * rows + my_next[1]
+        opp_index = opp_pos[0] * rows + opp_pos[1]
+        # Back to me to move, my new head becomes a trail
+        base = h ^ keys.side ^ occupied[my_index] ^ theirs[opp_index]
+
+        original_beta = beta
+        my_bit = 1 << my_index
+        for _, opp_next in replies:
+            if opp_next == my_next:
+                score = 0  # head-on, both crash
+            else:
+                index = opp_next[0] * rows + opp_next[1]
+                child = base ^ occupied[index] ^ theirs[index]
+                both = my_bit | (1 << index)
+                board.occupied |= both
+                if depth > 1:
+                    score = self._max(board, child, my_next, opp_next, depth - 1, alpha, beta)
+                else:
+                    score = self._evaluate(board, child, my_next, opp_next)
+                board.occupied ^= both
+            if score < beta:
+                beta = score
+                if alpha >= beta:
+                    break
+
+        if alpha >= beta:
+            flag = UPPER
+        elif beta >= original_beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(h, depth, beta, flag)
+        return beta
+
+    def _evaluate(self, board, h, my_pos, opp_pos):
+        """Voronoi score of a position, cached in the table at depth 0."""
+        entry = self.table.probe(h)
+        if entry is not None and entry[3] == EXACT:
+            return entry[2]
+        # A flood can cost more than the whole budget on big boards
+        if time.perf_counter() > self.deadline:
+            raise _Timeout()
+        self.nodes += 1
+        mine, theirs, _ = voronoi(board, my_pos, opp_pos)
+        score = mine - theirs
+        self.table.store(h, 0, score, EXACT)
+        return score
+
+# Delta-API entry point (bot_loader looks for `Bot`)
+Bot = SearchBot
+
+# Stats of the last get_move by any SearchBot, updated in place; delta
+# bots built by bot_loader are separate instances from _bot
+stats = {"depth": 0, "nodes": 0, "elapsed": 0.0, "nps": 0, "tt_hits": 0}
+
+_bot = SearchBot()
+
+def get_move(grid, my_pos, my_id, opp_pos):
+    return _bot.get_move(grid, my_pos, my_id, opp_pos)
@@ -1,22 +1,77 @@
 import random
-import queue
+
+import numpy as np
+
+import bitboard
+import chambers
+import endgame
+from bitboard import Bitboard, DistanceLayers, popcount, voronoi
+import distance_field
+from flatboard import FlatBoard
+
+# Territory evaluator used by get_move:
+#   "bitboard" - word-parallel layered flood on a packed Bitboard (default)
+#   "numpy"    - vectorized NumPy distance fields, uncapped, see distance_field.py
+#   "bfs"      - flat ring-buffer BFS
+EVAL_MODE = "bitboard"
+
+# Work counters, read by instrumentation.py: cells settled (by any side)
+# per territory flood, whichever evaluator ran it
+stats = {"bfs_nodes": 0}
 
 def get_move(grid, my_pos, my_id, opp_pos):
     """
     Advanced Voronoi-based Bot with Safety Heuristics.
     1. Maximize Territory (Voronoi).
     2. Maximize Openness (Don't hug walls if not needed).
+    `grid` is the arena grid or a Bitboard.
+    Stateless: every call floods both players from scratch with the
+    EVAL_MODE evaluator. VoronoiEvaluator is a separate, incremental code
+    path that shares find_valid_moves, cap_by_chambers and pick_best_move;
+    with the "bitboard" evaluator both pick the same move from the same
+    position and random state.
     """
-    cols = len(grid)
-    rows = len(grid[0])
+    # Pack once, then every evaluation below is word-parallel
+    board = grid if isinstance(grid, Bitboard) else Bitboard.from_grid(grid)
     
+    # 1. Evaluate each valid move
+    valid_moves = find_valid_moves(board, my_pos)
+            
+    if not valid_moves:
+        return "UP" # No moves, accept defeat
+
+    # Walled off from each other: territory is settled, just fill my region
+    if endgame.is_separated(board, my_pos, opp_pos):
+        return endgame.fill_move(board, my_pos)
+        
+    # 2. Run Simulations
+    evaluated = board if EVAL_MODE == "bitboard" or isinstance(grid, Bitboard) else grid
+    # A. Voronoi Score: How much territory can I secure? (all moves in one pass)
+    territories = calculate_voronoi_territories(
+        evaluated, [(nx, ny) for _, nx, ny in valid_moves], opp_pos, EVAL_MODE)
+
+    territories = cap_by_chambers(board, my_pos, valid_moves, territories)
+
+    return pick_best_move(board, valid_moves, territories)
+
+def cap_by_chambers(board, my_pos, valid_moves, territories):
+    """
+    Tunnel Vision Prevention: Voronoi counts every cell I reach first,
+    including "air pockets" behind a chokepoint that I could never fill
+    together. Cap each move's territory at the size of the chamber it
+    actually leads into (one chamber-analysis pass for all moves).
+    """
+    if len(valid_moves) < 2:
+        return territories
+    sizes = chambers.chamber_sizes(board, my_pos)
+    return [min(territory, sizes.get((nx, ny), 0))
+            for (_, nx, ny), territory in zip(valid_moves, territories)]
+
+def find_valid_moves(board, my_pos):
+    """(move, nx, ny) for every move that does not crash immediately, in random order."""
     possible_moves = ["UP", "DOWN", "LEFT", "RIGHT"]
     random.shuffle(possible_moves)
     
-    best_move = possible_moves[0]
-    best_score = -float('inf')
-    
-    # 1. Evaluate each valid move
     valid_moves = []
     
     for move in possible_moves:
@@ -27,21 +82,19 @@ def get_move(grid, my_pos, my_id, opp_pos):
         elif move == "RIGHT": nx += 1
         
         # Check immediate collision
-        if 0 <= nx < cols and 0 <= ny < rows and grid[nx][ny] == 0:
+        if board.is_free(nx, ny):
             valid_moves.append((move, nx, ny))
-            
-    if not valid_moves:
-        return "UP" # No moves, accept defeat
-        
-    # 2. Run Simulations
-    for move, nx, ny in valid_moves:
-        
-        # A. Voronoi Score: How much territory can I secure?
-        territory_score = calculate_voronoi_territory(grid, (nx, ny), opp_pos)
+    return valid_moves
+
+def pick_best_move(board, valid_moves, territories):
+    best_move = valid_moves[0][0]
+    best_score = -float('inf')
+
+    for (move, nx, ny), territory_score in zip(valid_moves, territories):
         
         # B. Openness Bonus: How many open neighbors does this new spot have?
         # This prevents the bot from entering tunnels/corners unnecessarily.
-        open_neighbors = count_open_neighbors(grid, nx, ny)
+        open_neighbors = count_open_neighbors(board, nx, ny)
         
         # Final Score = Territory + small bonus for open space
         # We weigh territory much higher (1.0) than openness (0.1)
@@ -53,8 +106,87 @@ def get_move(grid, my_pos, my_id, opp_pos):
             
     return best_move
 
+class VoronoiEvaluator:
+    """
+    Stateful, per-game counterpart of get_move (its own code path, not a
+    wrapper around it; see get_move for what the two share).
+    Keeps the opponent's distance field (bitboard.DistanceLayers) between
+    ticks and repairs it for the cells blocked since the last call instead
+    of flooding the opponent again. Use one instance per bot per game;
+    anything that is not a plain continuation of the last position (new
+    round, different board) falls back to a fresh flood.
+    Separation is permanent within a round, so once detected the evaluator
+    stops tracking the opponent and only runs the endgame fill.
+    It is also this module's delta-API bot (see tron_engine): start/step
+    keep one Bitboard for the round instead of repacking a grid per tick.
+    """
+    def __init__(self):
+        self.occupied = None
+        self.size = None
+        self.opp_field = None
+        self.separated = False
+        self.board = None
+
+    def start(self, grid, my_pos, my_id, opp_pos):
+        self.board = Bitboard.from_grid(grid)
+        self.my_id = my_id
+
+    def update(self, my_pos, opp_pos):
+        self.board.occupy(my_pos[0], my_pos[1])
+        self.board.occupy(opp_pos[0], opp_pos[1])
+
+    def step(self, my_pos, opp_pos):
+        self.update(my_pos, opp_pos)
+        return self.get_move(self.board, tuple(my_pos), self.my_id, tuple(opp_pos))
+
+    def get_move(self, grid, my_pos, my_id, opp_pos):
+        board = grid if isinstance(grid, Bitboard) else Bitboard.from_grid(grid)
+
+        size = (board.cols, board.rows)
+        previous = self.occupied
+        continued = (previous is not None and size == self.size
+                     and not previous & ~board.occupied)
+        self.occupied = board.occupied
+        self.size = size
+
+        if not continued:
+            self.separated = False
+        if not self.separated and endgame.is_separated(board, my_pos, opp_pos):
+            self.separated = True
+            self.opp_field = None
+        if self.separated:
+            return endgame.fill_move(board, my_pos)
+
+        if continued and self.opp_field is not None:
+            self.opp_field.advance(board, opp_pos, board.occupied & ~previous)
+        else:
+            self.opp_field = DistanceLayers(board, opp_pos)
+
+        valid_moves = find_valid_moves(board, my_pos)
+        if not valid_moves:
+            return "UP"
+
+        territories, settled = bitboard.voronoi_batch(
+            board, [(nx, ny) for _, nx, ny in valid_moves], opp_pos, self.opp_field.layers,
+            settled=True)
+        stats["bfs_nodes"] += sum(settled)
+        territories = cap_by_chambers(board, my_pos, valid_moves, territories)
+        return pick_best_move(board, valid_moves, territories)
+
+# Delta-API entry point (bot_loader looks for `Bot`)
+Bot = VoronoiEvaluator
+
 def count_open_neighbors(grid, cx, cy):
     """Counts how many empty cells are adjacent to (cx, cy)."""
+    if isinstance(grid, Bitboard):
+        # One shift/mask pass instead of four bounds-checked lookups
+        return popcount(grid.neighbors(grid.bit(cx, cy)) & grid.free)
+    if isinstance(grid, FlatBoard):
+        # Border cells are walls: four unchecked byte lookups
+        cells = grid.cells
+        idx = grid.index(cx, cy)
+        return sum(1 for offset in grid.neighbors if cells[idx + offset] == 0)
+
     cols = len(grid)
     rows = len(grid[0])
     count = 0
@@ -64,50 +196,202 @@ def count_open_neighbors(grid, cx, cy):
             count += 1
     return count
 
-def calculate_voronoi_territory(grid, my_start, opp_start):
+def calculate_voronoi_territory(grid, my_start, opp_start, mode="bfs"):
     """
     Runs a simultaneous BFS from both players.
     Returns the count of cells that 'my_start' reaches BEFORE 'opp_start'.
+    Ties go to 'my_start', since its side of the queue is expanded first.
+    A Bitboard is always flooded word-parallel; for arena grids `mode`
+    picks the evaluator (see EVAL_MODE).
     """
-    # --- FIX: Convert inputs to tuples to ensure they are hashable for the set ---
-    my_start = tuple(my_start)
-    opp_start = tuple(opp_start)
+    if isinstance(grid, Bitboard) or mode in ("bitboard", "numpy"):
+        if isinstance(grid, Bitboard):
+            mine, theirs, contested = voronoi(grid, my_start, opp_start)
+        elif mode == "bitboard":
+            mine, theirs, contested = voronoi(Bitboard.from_grid(grid), my_start, opp_start)
+        else:
+            mine, theirs, contested = distance_field.voronoi_counts(grid, my_start, opp_start)
+        stats["bfs_nodes"] += mine + theirs + contested
+        return mine + contested
+
+    board = grid if isinstance(grid, FlatBoard) else FlatBoard.from_grid(grid)
+    size = board.cols * board.rows
+    stride = board.stride
+
+    # Padded flat cell index (see flatboard.py). 'visited' starts as a copy
+    # of the board bytes, so trails and the wall border are already
+    # visited and each neighbour test is a single unchecked byte lookup.
+    visited = bytearray(board.cells)
+
+    # Preallocated ring of cell indices with head/tail pointers.
+    # Every cell is enqueued at most once, so it never wraps.
+    cells = [0] * (size + 2)
+    owners = bytearray(size + 2)
+    me = board.index(my_start[0], my_start[1])
+    opp = board.index(opp_start[0], opp_start[1])
+    cells[0] = me
+    cells[1] = opp
+    owners[0] = 1
+    owners[1] = 2
+    visited[me] = 1
+    visited[opp] = 1
+    head = 0
+    tail = 2
 
-    cols = len(grid)
-    rows = len(grid[0])
-    
-    # Q stores: (x, y, owner_id)
-    # owner_id: 1 = Me, 2 = Opponent
-    q = queue.Queue()
-    q.put((my_start[0], my_start[1], 1))
-    q.put((opp_start[0], opp_start[1], 2))
-    
-    visited = set()
-    visited.add(my_start)
-    visited.add(opp_start)
-    
     my_territory = 0
-    
-    # Run BFS
-    # Increased max_iterations to scan the WHOLE board (900 cells + margin)
-    iterations = 0
-    max_iterations = 2000 
-    
-    while not q.empty() and iterations < max_iterations:
-        cx, cy, owner = q.get()
-        iterations += 1
+
+    # Run BFS over the whole reachable board, whatever its size
+    while head < tail:
+        idx = cells[head]
+        owner = owners[head]
+        head += 1
         
         if owner == 1:
             my_territory += 1
-            
-        neighbors = [
-            (cx+1, cy), (cx-1, cy), (cx, cy+1), (cx, cy-1)
-        ]
-        
-        for nx, ny in neighbors:
-            if 0 <= nx < cols and 0 <= ny < rows:
-                if grid[nx][ny] == 0 and (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    q.put((nx, ny, owner))
-                    
-    return my_territory
\ No newline at end of file
+
+        # Same neighbour order as before: x+1, x-1, y+1, y-1
+        if not visited[idx + stride]:
+            visited[idx + stride] = 1
+            cells[tail] = idx + stride
+            owners[tail] = owner
+            tail += 1
+        if not visited[idx - stride]:
+            visited[idx - stride] = 1
+            cells[tail] = idx - stride
+            owners[tail] = owner
+            tail += 1
+        if not visited[idx + 1]:
+            visited[idx + 1] = 1
+            cells[tail] = idx + 1
+            owners[tail] = owner
+            tail += 1
+        if not visited[idx - 1]:
+            visited[idx - 1] = 1
+            cells[tail] = idx - 1
+            owners[tail] = owner
+            tail += 1
+
+    stats["bfs_nodes"] += head
+    return my_territory
+
+def calculate_voronoi_territories(grid, starts, opp_start, mode="bfs"):
+    """
+    calculate_voronoi_territory for several candidate starts at once.
+    The bitboard and numpy evaluators flood the opponent once and share it
+    across every candidate; "bfs" falls back to one flood per start.
+    """
+    if isinstance(grid, Bitboard):
+        territories, settled = bitboard.voronoi_batch(grid, starts, opp_start, settled=True)
+    elif mode == "bitboard":
+        territories, settled = bitboard.voronoi_batch(
+            Bitboard.from_grid(grid), starts, opp_start, settled=True)
+    elif mode == "numpy":
+        territories, settled = distance_field.voronoi_batch(grid, starts, opp_start, settled=True)
+    else:
+        # Counted per flood by calculate_voronoi_territory
+        return [calculate_voronoi_territory(grid, start, opp_start) for start in starts]
+    stats["bfs_nodes"] += sum(settled)
+    return territories
+
+def calculate_voronoi_regions(grid, starts, mode="bfs"):
+    """
+    Every start's Voronoi region in one multi-source pass, for N-player
+    boards: all starts flood together instead of one flood per pair.
+    Returns (closest, tied): per start, the cells strictly closest to it
+    and the cells it ties for with other starts. `mode` as for
+    calculate_voronoi_territory; at most 8 starts.
+    """
+    if isinstance(grid, Bitboard) or mode == "bitboard":
+        board = grid if isinstance(grid, Bitboard) else Bitboard.from_grid(grid)
+        closest, tied, settled = bitboard.voronoi_regions(board, starts, settled=True)
+    elif mode == "numpy":
+        closest, tied, settled = distance_field.voronoi_regions(grid, starts, settled=True)
+    else:
+        closest, tied, settled = ring_voronoi_regions(grid, starts)
+    stats["bfs_nodes"] += settled
+    return closest, tied
+
+def ring_voronoi_regions(grid, starts):
+    """
+    Layer-by-layer flat BFS behind calculate_voronoi_regions' "bfs" mode.
+    Each cell keeps a bitmask of the starts that reached it first; a cell
+    reached again on the same layer by another start adds that start's bits.
+    Returns (closest, tied, settled) like voronoi_regions(..., settled=True).
+    """
+    board = grid if isinstance(grid, FlatBoard) else FlatBoard.from_grid(grid)
+    stride = board.stride
+
+    # As in calculate_voronoi_territory, trails and the border are visited
+    visited = bytearray(board.cells)
+    owners = bytearray(len(visited))
+    layers = [0] * len(visited)
+    front = []
+    for i, (x, y) in enumerate(starts):
+        idx = board.index(x, y)
+        visited[idx] = 1
+        owners[idx] |= 1 << i
+        layers[idx] = 1
+        front.append(idx)
+
+    layer = 1
+    while front:
+        layer += 1
+        reached = []
+        for idx in front:
+            owner = owners[idx]
+            for n in (idx + stride, idx - stride, idx + 1, idx - 1):
+                if not visited[n]:
+                    visited[n] = 1
+                    owners[n] = owner
+                    layers[n] = layer
+                    reached.append(n)
+                elif layers[n] == layer:
+                    owners[n] |= owner
+        front = reached
+
+    return distance_field.owner_counts(np.frombuffer(owners, dtype=np.uint8), len(starts), settled=True)
+
+# --- FREE-FOR-ALL ---
+
+def get_ffa_move(grid, heads, my_id):
+    """
+    N-player get_move (see tron_engine's free-for-all API): the same
+    territory + openness score, with every live opponent in one
+    multi-source Voronoi pass per candidate move.
+    """
+    board = grid if isinstance(grid, Bitboard) else Bitboard.from_grid(grid)
+    my_pos = heads[my_id - 1]
+    opponents = [tuple(pos) for player, pos in enumerate(heads, 1)
+                 if pos is not None and player != my_id]
+
+    valid_moves = find_valid_moves(board, my_pos)
+    if not valid_moves:
+        return "UP"
+
+    if endgame.is_isolated(board, my_pos, opponents):
+        return endgame.fill_move(board, my_pos)
+
+    evaluated = board if EVAL_MODE == "bitboard" or isinstance(grid, Bitboard) else grid
+    territories = []
+    for _, nx, ny in valid_moves:
+        closest, tied = calculate_voronoi_regions(evaluated, [(nx, ny)] + opponents, EVAL_MODE)
+        # Ties count for me, as in the two-player evaluators
+        territories.append(closest[0] + tied[0])
+
+    territories = cap_by_chambers(board, my_pos, valid_moves, territories)
+    return pick_best_move(board, valid_moves, territories)
+
+class FreeForAllBot:
+    """Free-for-all delta-API bot: one Bitboard per round, updated with the heads."""
+    def start(self, grid, heads, my_id):
+        self.board = Bitboard.from_grid(grid)
+        self.my_id = my_id
+
+    def update(self, heads):
+        for pos in heads:
+            if pos is not None:
+                self.board.occupy(pos[0], pos[1])
+
+    def step(self, heads):
+        self.update(heads)
+        return get_ffa_move(self.board, heads, self.my_id)
@@ -0,0 +1,26 @@
+import pickle
+
+import smart_tron_bot
+from instrumentation import Histogram, TimedPlayer
+from tron_engine import TronEngine, P1
+
+def test_timed_player_pickle_round_trip():
+    # Process workers (bot_driver.AsyncBot) receive the player pickled
+    player = TimedPlayer(smart_tron_bot.Bot(), Histogram())
+    player.histogram.record(0.01)
+
+    copy = pickle.loads(pickle.dumps(player))
+
+    assert isinstance(copy.player, smart_tron_bot.Bot)
+    assert copy.histogram.count == 1
+    engine = TronEngine(30, 30)
+    copy.start(engine.grid, engine.p1_pos, P1, engine.p2_pos)
+    assert copy.step(engine.p1_pos, engine.p2_pos) in ("UP", "DOWN", "LEFT", "RIGHT")
+    assert copy.histogram.count == 2
+
+def test_timed_player_forwards_attributes():
+    class Player:
+        timeouts = 3
+
+    player = TimedPlayer(Player(), Histogram())
+    assert player.timeouts == 3
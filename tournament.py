@@ -0,0 +1,230 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+import bot_loader
+import maps
+import replay
+from tron_engine import play_ffa_round, play_round, DRAW, P1, P2
+
+# --- HEADLESS TOURNAMENT RUNNER ---
+# Rounds are independent, so they are spread over a process pool
+# (one worker per core). Every round gets its own seed, derived from the
+# tournament seed, so a tournament replays identically whatever the
+# worker count or scheduling order.
+
+COLS = 30
+ROWS = 30
+
+_bot_cache = {}
+_map_cache = {}
+
+def load_bot(name, seat=None, isolated=False, time_limit=bot_loader.TIME_LIMIT):
+    """
+    Delta-API player for a bot module, one per (module, seat) per worker,
+    reused for every round (start() resets it). Isolated bots run in their
+    own subprocess, which therefore also stays up between rounds.
+    """
+    key = (name, seat, isolated)
+    if key not in _bot_cache:
+        _bot_cache[key] = bot_loader.load_player(name, isolated, time_limit)
+    return _bot_cache[key]
+
+def load_map(name):
+    """Map by name or path, parsed once per worker."""
+    if name not in _map_cache:
+        _map_cache[name] = maps.load_map(name)
+    return _map_cache[name]
+
+def round_seed(seed, round_index):
+    return seed * 1000003 + round_index
+
+def play_match(job):
+    """
+    Worker entry point: plays one seeded round and returns its result,
+    plus the packed replay record when `record` is set.
+    """
+    round_index, bot1_name, bot2_name, cols, rows, seed, isolated, time_limit, record, map_name = job
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+    bot1 = load_bot(bot1_name, P1, isolated, time_limit)
+    bot2 = load_bot(bot2_name, P2, isolated, time_limit)
+    moves = [] if record else None
+    game_map = load_map(map_name) if map_name else None
+    engine = play_round(bot1, bot2, cols, rows, moves, game_map)
+    if record:
+        return (round_index, engine.winner, engine.ticks,
+                replay.pack_round(seed, engine.starts, moves, engine.winner))
+    return round_index, engine.winner, engine.ticks
+
+def run_tournament(bot1_name, bot2_name, matches, cols=COLS, rows=ROWS, seed=0, workers=None,
+                   isolated=False, time_limit=bot_loader.TIME_LIMIT, replay_path=None, map_name=None):
+    """
+    Plays `matches` rounds in parallel and returns the aggregated stats.
+    Results are ordered by round index. With `isolated`, every bot runs in
+    its own subprocess and a move slower than `time_limit` seconds forfeits.
+    With `replay_path`, every round is appended to that replay file.
+    `map_name` (see maps.py) replaces the open cols x rows board.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    walls = None
+    if map_name:
+        game_map = load_map(map_name)
+        cols, rows, walls = game_map.cols, game_map.rows, game_map.walls
+
+    record = replay_path is not None
+    jobs = [(i, bot1_name, bot2_name, cols, rows, round_seed(seed, i), isolated, time_limit, record,
+             map_name) for i in range(matches)]
+
+    chunksize = max(1, matches // (workers * 8))
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    writer = replay.ReplayWriter(replay_path, cols, rows, (bot1_name, bot2_name),
+                                 walls) if record else None
+    results = []
+    try:
+        if pool is None:
+            stream = map(play_match, jobs)
+        elif record:
+            # In round order, so the replay file is too
+            stream = pool.imap(play_match, jobs, chunksize)
+        else:
+            stream = pool.imap_unordered(play_match, jobs, chunksize)
+        for result in stream:
+            if writer is not None:
+                writer.write_record(result[3])
+                result = result[:3]
+            results.append(result)
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if writer is not None:
+            writer.close()
+    results.sort()
+
+    p1_score = sum(1 for _, winner, _ in results if winner == P1)
+    p2_score = sum(1 for _, winner, _ in results if winner == P2)
+    draws = matches - p1_score - p2_score
+    ticks = [t for _, _, t in results]
+
+    return {
+        "matches": matches,
+        "p1_score": p1_score,
+        "p2_score": p2_score,
+        "draws": draws,
+        # Same definition as the arena sidebar: wins / matches played
+        "p1_win_rate": int((p1_score / matches) * 100) if matches else 0,
+        "p2_win_rate": int((p2_score / matches) * 100) if matches else 0,
+        "avg_ticks": (sum(ticks) / matches) if matches else 0,
+        "rounds": results,
+    }
+
+# --- FREE-FOR-ALL ---
+# One bot per seat, 2 to 8 seats (see tron_engine), same seeding and pool.
+
+def load_ffa_bot(name, seat):
+    """Free-for-all player for a bot module, one per (module, seat) per worker."""
+    key = ("ffa", name, seat)
+    if key not in _bot_cache:
+        _bot_cache[key] = bot_loader.load_ffa_player(name)
+    return _bot_cache[key]
+
+def play_ffa_match(job):
+    """Worker entry point for one seeded free-for-all round."""
+    round_index, bot_names, cols, rows, seed, map_name = job
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+    bots = [load_ffa_bot(name, seat) for seat, name in enumerate(bot_names, 1)]
+    game_map = load_map(map_name) if map_name else None
+    engine = play_ffa_round(bots, cols, rows, game_map)
+    return round_index, engine.winner, engine.ticks
+
+def run_ffa_tournament(bot_names, matches, cols=COLS, rows=ROWS, seed=0, workers=None, map_name=None):
+    """
+    Plays `matches` free-for-all rounds, seat i + 1 driven by bot_names[i],
+    and returns wins per seat plus the same totals as run_tournament.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    jobs = [(i, tuple(bot_names), cols, rows, round_seed(seed, i), map_name) for i in range(matches)]
+    chunksize = max(1, matches // (workers * 8))
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            results = list(pool.imap_unordered(play_ffa_match, jobs, chunksize))
+    else:
+        results = [play_ffa_match(job) for job in jobs]
+    results.sort()
+
+    wins = [sum(1 for _, winner, _ in results if winner == seat)
+            for seat in range(1, len(bot_names) + 1)]
+    ticks = [t for _, _, t in results]
+
+    return {
+        "matches": matches,
+        "wins": wins,
+        "draws": sum(1 for _, winner, _ in results if winner == DRAW),
+        "win_rates": [int((w / matches) * 100) if matches else 0 for w in wins],
+        "avg_ticks": (sum(ticks) / matches) if matches else 0,
+        "rounds": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless TRON bot tournament on all cores.")
+    parser.add_argument("--p1", default="smart_tron_bot", help="Blue bot module (default: smart_tron_bot)")
+    parser.add_argument("--p2", default="smart_tron_bot", help="Red bot module (default: smart_tron_bot)")
+    parser.add_argument("--p1-name", default="BLUE BOT")
+    parser.add_argument("--p2-name", default="RED BOT")
+    parser.add_argument("-n", "--matches", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Process count (default: one per core)")
+    parser.add_argument("--cols", type=int, default=COLS)
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--map", default=None,
+                        help="Map name or .tmap file (overrides --cols/--rows), see maps.py")
+    parser.add_argument("--isolated", action="store_true",
+                        help="Run each bot in its own subprocess with a per-move time limit")
+    parser.add_argument("--time-limit", type=float, default=bot_loader.TIME_LIMIT,
+                        help="Seconds per move for isolated bots; slower moves forfeit the round")
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="Append every round to this replay file (see replay.py)")
+    parser.add_argument("--ffa", nargs="+", default=None, metavar="BOT",
+                        help="Free-for-all instead: one bot module per seat, 2 to 8 seats")
+    args = parser.parse_args()
+
+    if args.ffa:
+        if args.isolated or args.record:
+            parser.error("--ffa runs bots in-process and does not record replays")
+        start = time.perf_counter()
+        stats = run_ffa_tournament(args.ffa, args.matches, args.cols, args.rows, args.seed,
+                                   args.workers, args.map)
+        elapsed = time.perf_counter() - start
+
+        print(f"FREE-FOR-ALL OVER: {stats['matches']} matches in {elapsed:.2f}s")
+        for seat, name in enumerate(args.ffa):
+            print(f"  P{seat + 1} {name[:20]:<20} WINS: {stats['wins'][seat]} ({stats['win_rates'][seat]}%)")
+        print(f"  DRAWS:       {stats['draws']}")
+        print(f"  AVG ROUND:   {stats['avg_ticks']:.1f} ticks")
+        return
+
+    start = time.perf_counter()
+    stats = run_tournament(args.p1, args.p2, args.matches, args.cols, args.rows, args.seed, args.workers,
+                           args.isolated, args.time_limit, args.record, args.map)
+    elapsed = time.perf_counter() - start
+
+    print(f"TOURNAMENT OVER: {stats['matches']} matches in {elapsed:.2f}s")
+    print(f"  {args.p1_name[:12]:<12} WINS: {stats['p1_score']} ({stats['p1_win_rate']}%)")
+    print(f"  {args.p2_name[:12]:<12} WINS: {stats['p2_score']} ({stats['p2_win_rate']}%)")
+    print(f"  DRAWS:       {stats['draws']}")
+    print(f"  AVG ROUND:   {stats['avg_ticks']:.1f} ticks")
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,330 @@
+import inspect
+
+import numpy as np
+
+import maps
+from flatboard import FlatBoard, WALL
+
+# --- HEADLESS SIMULATION CORE ---
+# No pygame, no audio, no frame cap. Both front-ends (arena.py, game.py)
+# render on top of this, and batch runners can drive it directly.
+
+DIRECTIONS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0),
+}
+
+# Round results
+DRAW = 0
+P1 = 1
+P2 = 2
+
+class TronEngine:
+    """
+    Two-player round on a cols x rows board. `walls` is an optional
+    (cols, rows) bool array of static wall cells and `starts` the default
+    start positions (see maps.py); both stay the same for every round.
+    """
+    def __init__(self, cols, rows, walls=None, starts=None):
+        self.cols = cols
+        self.rows = rows
+        self.walls = walls
+        self.default_starts = starts or [(5, rows // 2), (cols - 6, rows // 2)]
+        self.reset()
+
+    @classmethod
+    def from_map(cls, game_map):
+        return cls(game_map.cols, game_map.rows, game_map.walls, game_map.starts)
+
+    def reset(self, p1_pos=None, p2_pos=None):
+        # uint8 cells with a wall border, see flatboard.py
+        self.grid = FlatBoard(self.cols, self.rows)
+        if self.walls is not None:
+            self.grid.view[self.walls] = WALL
+        self.p1_pos = list(p1_pos if p1_pos is not None else self.default_starts[0])
+        self.p2_pos = list(p2_pos if p2_pos is not None else self.default_starts[1])
+        self.starts = (list(self.p1_pos), list(self.p2_pos))
+        self.grid.set(self.p1_pos[0], self.p1_pos[1], P1)
+        self.grid.set(self.p2_pos[0], self.p2_pos[1], P2)
+        self.round_over = False
+        self.winner = None
+        self.ticks = 0
+
+    def is_safe(self, x, y):
+        return self.grid.is_free(x, y)
+
+    def step(self, move1, move2):
+        """
+        Advances both cycles one cell at the same time.
+        Returns the winner (P1, P2 or DRAW) once the round ends, else None.
+        A missing move (None, e.g. a bot that timed out) is a crash.
+        """
+        if self.round_over:
+            return self.winner
+
+        # Heads are always on the board, so their neighbours are at most
+        # the wall border: one byte lookup each, no bounds checks.
+        # An unknown move has offset 0, i.e. the cycle's own (taken) cell.
+        grid = self.grid
+        cells = grid.cells
+        moves = grid.moves
+        i1 = grid.index(self.p1_pos[0], self.p1_pos[1]) + moves.get(move1, 0)
+        i2 = grid.index(self.p2_pos[0], self.p2_pos[1]) + moves.get(move2, 0)
+
+        p1_dead = cells[i1] != 0
+        p2_dead = cells[i2] != 0
+
+        # Head-on: both cycles enter the same cell
+        if i1 == i2:
+            p1_dead = True
+            p2_dead = True
+
+        self.ticks += 1
+
+        if p1_dead or p2_dead:
+            if p1_dead and p2_dead:
+                self.winner = DRAW
+            elif p1_dead:
+                self.winner = P2
+            else:
+                self.winner = P1
+            self.round_over = True
+            return self.winner
+
+        cells[i1] = P1
+        cells[i2] = P2
+        self.p1_pos = list(grid.xy(i1))
+        self.p2_pos = list(grid.xy(i2))
+        return None
+
+# --- DELTA BOT API ---
+# Arena-standard bots get a fresh copy of the whole grid every tick. A
+# delta bot sees the board once per round and keeps its own state in
+# whatever representation it likes; each tick it only gets both heads,
+# which are the only cells that changed:
+#
+#   bot.start(grid, my_pos, my_id, opp_pos)   new round (grid: initial board)
+#   bot.update(my_pos, opp_pos)               record a tick without moving
+#   bot.step(my_pos, opp_pos) -> move         record a tick and pick a move
+#
+# Bot modules opt in by exposing a `Bot` class; plain get_move functions
+# are wrapped in GridBot.
+
+class GridBot:
+    """
+    Delta-API adapter for an Arena-standard get_move; keeps the grid itself
+    as a plain (cols, rows) uint8 array, which is what get_move bots are
+    handed (FlatBoard stays internal to the engine and delta bots).
+    """
+    def __init__(self, get_move):
+        self.get_move = get_move
+
+    def start(self, grid, my_pos, my_id, opp_pos):
+        self.grid = np.array(grid, dtype=np.uint8)
+        self.my_id = my_id
+        self.opp_id = P1 + P2 - my_id
+
+    def update(self, my_pos, opp_pos):
+        self.grid[my_pos[0]][my_pos[1]] = self.my_id
+        self.grid[opp_pos[0]][opp_pos[1]] = self.opp_id
+
+    def step(self, my_pos, opp_pos):
+        self.update(my_pos, opp_pos)
+        # Arena-standard bots may scribble on the grid they are given
+        return self.get_move(self.grid.copy(), list(my_pos), self.my_id, list(opp_pos))
+
+def as_player(bot):
+    """A delta-API bot as is, or an Arena-standard get_move wrapped in GridBot."""
+    return bot if hasattr(bot, "step") else GridBot(bot)
+
+def play_round(bot1, bot2, cols, rows, moves=None, game_map=None):
+    """
+    Plays one full round between two bots (delta-API objects or
+    Arena-standard get_move functions) as fast as the CPU allows.
+    Returns the finished engine so callers can read winner/ticks.
+    If `moves` is a list, every tick's (move1, move2) is appended to it.
+    `game_map` (see maps.py) overrides cols/rows with its own board.
+    """
+    engine = TronEngine(cols, rows) if game_map is None else TronEngine.from_map(game_map)
+    bot1 = as_player(bot1)
+    bot2 = as_player(bot2)
+    bot1.start(engine.grid, engine.p1_pos, P1, engine.p2_pos)
+    bot2.start(engine.grid, engine.p2_pos, P2, engine.p1_pos)
+    while not engine.round_over:
+        move1 = bot1.step(engine.p1_pos, engine.p2_pos)
+        move2 = bot2.step(engine.p2_pos, engine.p1_pos)
+        if moves is not None:
+            moves.append((move1, move2))
+        engine.step(move1, move2)
+    return engine
+
+# --- FREE-FOR-ALL ---
+# 2 to MAX_PLAYERS cycles on one board, player ids 1..N (a cell's value
+# is the id of the trail on it). All cycles move at once; a cycle crashes
+# into any taken cell, and every cycle entering the same cell in the same
+# tick crashes there (a head-on of two or more). Crashed cycles leave
+# their trails behind as walls. The last cycle left wins; if the last
+# ones all crash in the same tick, the round is a draw.
+#
+# Free-for-all bots see every head at once: `heads[i]` is player i + 1's
+# head, or None once it has crashed.
+#
+#   get_ffa_move(grid, heads, my_id) -> move     Arena-standard
+#   bot.start(grid, heads, my_id)                delta API, a module's
+#   bot.update(heads)                            `FreeForAllBot` class
+#   bot.step(heads) -> move
+#
+# A module with neither plays its two-player get_move against the
+# nearest live opponent (FreeForAllGridBot).
+
+MAX_PLAYERS = 8
+
+class FreeForAllEngine:
+    """
+    N-player round on a cols x rows board; `walls` and `starts` as for
+    TronEngine (at least `players` starts). `crashed[i]` is the tick on
+    which player i + 1 crashed, None while alive.
+    """
+    def __init__(self, cols, rows, players, walls=None, starts=None):
+        if not 2 <= players <= MAX_PLAYERS:
+            raise ValueError(f"free-for-all needs 2 to {MAX_PLAYERS} players, not {players}")
+        if starts is None:
+            starts = maps.default_starts(cols, rows, players)
+        if len(set(map(tuple, starts[:players]))) < players:
+            raise ValueError(f"{players} players need {players} different starts")
+        self.cols = cols
+        self.rows = rows
+        self.players = players
+        self.walls = walls
+        self.default_starts = [tuple(pos) for pos in starts[:players]]
+        self.reset()
+
+    @classmethod
+    def from_map(cls, game_map, players):
+        return cls(game_map.cols, game_map.rows, players, game_map.walls, game_map.starts)
+
+    def reset(self, starts=None):
+        self.grid = FlatBoard(self.cols, self.rows)
+        if self.walls is not None:
+            self.grid.view[self.walls] = WALL
+        self.heads = [list(pos) for pos in (starts or self.default_starts)]
+        self.starts = [list(pos) for pos in self.heads]
+        for player, (x, y) in enumerate(self.heads, 1):
+            self.grid.set(x, y, player)
+        self.crashed = [None] * self.players
+        self.alive = self.players
+        self.round_over = False
+        self.winner = None
+        self.ticks = 0
+
+    def step(self, moves):
+        """
+        Advances every live cycle one cell at the same time; `moves[i]` is
+        player i + 1's move (ignored once it has crashed, None = crash).
+        Returns the winner's id or DRAW once the round ends, else None.
+        """
+        if self.round_over:
+            return self.winner
+
+        grid = self.grid
+        cells = grid.cells
+        offsets = grid.moves
+        targets = {}
+        for player, head in enumerate(self.heads):
+            if head is not None:
+                target = grid.index(head[0], head[1]) + offsets.get(moves[player], 0)
+                targets.setdefault(target, []).append(player)
+
+        self.ticks += 1
+        survivors = []
+        for target, players in targets.items():
+            # Taken cell, or entered by more than one cycle this tick
+            if cells[target] != 0 or len(players) > 1:
+                for player in players:
+                    self.heads[player] = None
+                    self.crashed[player] = self.ticks
+            else:
+                survivors.append((target, players[0]))
+
+        for target, player in survivors:
+            cells[target] = player + 1
+            self.heads[player] = list(grid.xy(target))
+        self.alive = len(survivors)
+
+        if self.alive <= 1:
+            self.winner = survivors[0][1] + 1 if survivors else DRAW
+            self.round_over = True
+            return self.winner
+        return None
+
+    def placings(self):
+        """Player ids, last one standing first; players that crashed together share a tick."""
+        return sorted(range(1, self.players + 1),
+                      key=lambda player: -(self.crashed[player - 1] or self.ticks + 1))
+
+def nearest(my_pos, positions):
+    """The position closest to my_pos (Manhattan distance); first wins ties."""
+    return min(positions, key=lambda pos: abs(pos[0] - my_pos[0]) + abs(pos[1] - my_pos[1]))
+
+class FreeForAllGridBot:
+    """
+    Free-for-all delta-API adapter for a module's get_ffa_move or, failing
+    that, its two-player get_move aimed at the nearest live opponent.
+    Keeps the grid itself as a plain numpy array, like GridBot.
+    """
+    def __init__(self, get_move=None, get_ffa_move=None):
+        self.get_move = get_move
+        self.get_ffa_move = get_ffa_move
+
+    def start(self, grid, heads, my_id):
+        self.grid = np.array(grid, dtype=np.uint8)
+        self.my_id = my_id
+
+    def update(self, heads):
+        for player, pos in enumerate(heads, 1):
+            if pos is not None:
+                self.grid[pos[0]][pos[1]] = player
+
+    def step(self, heads):
+        self.update(heads)
+        heads = [list(pos) if pos is not None else None for pos in heads]
+        if self.get_ffa_move is not None:
+            return self.get_ffa_move(self.grid.copy(), heads, self.my_id)
+        my_pos = heads[self.my_id - 1]
+        opponents = [pos for player, pos in enumerate(heads, 1)
+                     if pos is not None and player != self.my_id]
+        return self.get_move(self.grid.copy(), my_pos, self.my_id, nearest(my_pos, opponents))
+
+def as_ffa_player(bot):
+    """
+    A free-for-all delta bot as is, or a function wrapped in
+    FreeForAllGridBot: get_ffa_move(grid, heads, my_id) takes three
+    arguments, a two-player get_move(grid, my_pos, my_id, opp_pos) four.
+    """
+    if hasattr(bot, "step"):
+        return bot
+    if len(inspect.signature(bot).parameters) == 3:
+        return FreeForAllGridBot(get_ffa_move=bot)
+    return FreeForAllGridBot(bot)
+
+def play_ffa_round(bots, cols, rows, game_map=None):
+    """
+    Plays one free-for-all round, one bot per player (free-for-all delta
+    bots, get_ffa_move or two-player get_move functions; see
+    as_ffa_player). Returns the finished engine.
+    """
+    if game_map is None:
+        engine = FreeForAllEngine(cols, rows, len(bots))
+    else:
+        engine = FreeForAllEngine.from_map(game_map, len(bots))
+    players = [as_ffa_player(bot) for bot in bots]
+    for player_id, player in enumerate(players, 1):
+        player.start(engine.grid, engine.heads, player_id)
+    while not engine.round_over:
+        heads = list(engine.heads)
+        moves = [player.step(heads) if heads[i] is not None else None
+                 for i, player in enumerate(players)]
+        engine.step(moves)
+    return engine
@@ -0,0 +1,110 @@
+import random
+
+# --- ZOBRIST HASHING ---
+# A position is (occupied cells, my head, opponent's head, side to move).
+# Its hash is the XOR of one random 64-bit key per feature, so making or
+# unmaking a move is a couple of XORs instead of rehashing the board.
+
+_key_cache = {}
+
+class ZobristKeys:
+    """
+    Random keys for one board size, flat index x * rows + y:
+      occupied[i] - cell i is a trail
+      mine[i]     - my head is on cell i
+      theirs[i]   - the opponent's head is on cell i
+      side        - the opponent is to move
+    """
+    def __init__(self, cols, rows, seed=0x7470):
+        # Private generator: tournaments seed the global one per round
+        rng = random.Random(seed * 1000003 + cols * 1009 + rows)
+        size = cols * rows
+        self.rows = rows
+        self.occupied = [rng.getrandbits(64) for _ in range(size)]
+        self.mine = [rng.getrandbits(64) for _ in range(size)]
+        self.theirs = [rng.getrandbits(64) for _ in range(size)]
+        self.side = rng.getrandbits(64)
+
+    @classmethod
+    def for_size(cls, cols, rows):
+        key = (cols, rows)
+        if key not in _key_cache:
+            _key_cache[key] = cls(cols, rows)
+        return _key_cache[key]
+
+    def hash_cells(self, bits):
+        """XOR of the occupied keys of every set bit."""
+        # Scan the binary digits (least significant first) rather than
+        # clearing bits one by one: each clear copies the whole big int.
+        occupied = self.occupied
+        digits = bin(bits)[:1:-1]
+        h = 0
+        i = digits.find("1")
+        while i >= 0:
+            h ^= occupied[i]
+            i = digits.find("1", i + 1)
+        return h
+
+    def hash_heads(self, my_pos, opp_pos):
+        rows = self.rows
+        return self.mine[my_pos[0] * rows + my_pos[1]] ^ self.theirs[opp_pos[0] * rows + opp_pos[1]]
+
+# --- TRANSPOSITION TABLE ---
+
+EXACT = 0
+LOWER = 1  # value is a lower bound (search failed high)
+UPPER = 2  # value is an upper bound (search failed low)
+
+# Rough size of one stored entry (tuple + its ints) used for the memory cap
+ENTRY_BYTES = 160
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results, two slots per bucket:
+    slot 0 keeps the deepest result (depth-preferred), slot 1 takes
+    whatever did not fit there (always-replace). Entries left over from
+    an earlier search (see new_search) give way to new ones regardless of
+    depth, so results carry across ticks without clogging the table.
+    Entries are (key, depth, value, flag, move, generation).
+    """
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        buckets = 1
+        while buckets * 4 * ENTRY_BYTES <= max_bytes:
+            buckets *= 2
+        self.mask = buckets - 1
+        self.slots = [None] * (buckets * 2)
+        self.generation = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+
+    def probe(self, key):
+        """The entry stored for `key`, or None."""
+        i = (key & self.mask) << 1
+        slots = self.slots
+        entry = slots[i]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = slots[i + 1]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag, move=None):
+        i = (key & self.mask) << 1
+        slots = self.slots
+        old = slots[i]
+        entry = (key, depth, value, flag, move, self.generation)
+        if (old is None or old[0] == key or depth >= old[1]
+                or old[5] != self.generation):
+            slots[i] = entry
+        else:
+            slots[i + 1] = entry
+        self.stores += 1